@@ -8,15 +8,19 @@ from typing import Dict, List
 # ==============================================================================
 # LLM Provider Configuration (Dual-Provider Support)
 # ==============================================================================
-PROVIDER = os.getenv("LLM_PROVIDER", "google")  # 'google' or 'openai'
+# Single snapshot of the environment; avoids repeated os.environ proxy
+# lookups. Callers must load .env (load_dotenv) before importing config.
+_env = dict(os.environ)
+
+PROVIDER = _env.get("LLM_PROVIDER", "google")  # 'google' or 'openai'
 
 # OpenAI Configuration
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+OPENAI_API_KEY = _env.get("OPENAI_API_KEY")
+OPENAI_MODEL = _env.get("OPENAI_MODEL", "gpt-4o")
 
 # Google Configuration
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-GOOGLE_MODEL = os.getenv("GOOGLE_MODEL", "gemini-1.5-pro")
+GOOGLE_API_KEY = _env.get("GOOGLE_API_KEY")
+GOOGLE_MODEL = _env.get("GOOGLE_MODEL", "gemini-1.5-pro")
 
 # ==============================================================================
 # Quality Dimensions (Mapped from RL Tool Use Data Generation Rubric)
@@ -100,8 +104,9 @@ FLAGS = {
 # ==============================================================================
 DATA_DIR = "data"
 RESULTS_FILE = "results/results.csv"
-DETAILED_RESULTS_FILE = "results/results.json"
+DETAILED_RESULTS_FILE = "results/results.jsonl"
 ERROR_LOG_FILE = "logs/error_log.txt"
+LLM_CACHE_DIR = "results/llm_cache"
 
 # ==============================================================================
 # Processing Configuration
@@ -113,9 +118,12 @@ REQUEST_TIMEOUT = 120
 # ==============================================================================
 # CSV Headers
 # ==============================================================================
-CSV_HEADERS = [
-    "task_id", 
-    "config_file", 
+# Bound once at import so hot paths never rebuild the dimension-name list
+DIMENSION_NAMES = tuple(qd["name"] for qd in QUALITY_DIMENSIONS.values())
+
+CSV_HEADERS = (
+    "task_id",
+    "config_file",
     "results_file",
     "reviewed_at"
-] + [qd["name"] for qd in QUALITY_DIMENSIONS.values()]
+) + DIMENSION_NAMES
@@ -12,22 +12,48 @@ sys.path.insert(0, PROJECT_ROOT)
 from dotenv import load_dotenv
 load_dotenv(os.path.join(PROJECT_ROOT, '.env'))
 
-from flask import Flask, request, jsonify, send_from_directory, send_file, Response
+from flask import Flask, request, jsonify, send_from_directory, Response, stream_with_context
 import requests
+from requests.adapters import HTTPAdapter
 import base64
 from werkzeug.utils import secure_filename
+import atexit
+import fcntl
+import hmac
+import io
 import json
 import csv
 import logging
+import threading
+import time
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor
 
 from quality_evaluator import QualityEvaluator
-from config import QUALITY_DIMENSIONS, PROVIDER, GOOGLE_API_KEY, OPENAI_API_KEY
+from config import QUALITY_DIMENSIONS, PROVIDER, GOOGLE_API_KEY, OPENAI_API_KEY, LLM_CACHE_DIR
+
+# orjson is optional but parses/serializes severalfold faster than stdlib json
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj)
 
 # Paths
 RESULTS_CSV = os.path.join(PROJECT_ROOT, 'results', 'results.csv')
-RESULTS_JSON = os.path.join(PROJECT_ROOT, 'results', 'results.json')
+RESULTS_JSONL = os.path.join(PROJECT_ROOT, 'results', 'results.jsonl')
+LLM_CACHE_PATH = os.path.join(PROJECT_ROOT, LLM_CACHE_DIR)
 
 # Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -37,31 +63,66 @@ app = Flask(__name__,
             static_folder=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'),
             static_url_path='/static')
 app.config['MAX_CONTENT_LENGTH'] = 32 * 1024 * 1024  # 32MB max
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 300  # let browsers cache static assets
+
+# Optional gzip/brotli compression; large history payloads shrink 5-10x
+try:
+    from flask_compress import Compress
+    app.config['COMPRESS_MIMETYPES'] = ['application/json']
+    app.config['COMPRESS_LEVEL'] = 4
+    Compress(app)
+except ImportError:
+    pass
+
+# Env snapshot taken after load_dotenv; avoids repeated environ proxy lookups
+_env = dict(os.environ)
 
-app.secret_key = os.environ.get('FRONTEND_SECRET_KEY', 'rltooluseeval-dev-secret')
+app.secret_key = _env.get('FRONTEND_SECRET_KEY', 'rltooluseeval-dev-secret')
 
 THREADS_PER_TASK = 4
-ADMIN_USER = os.environ.get('ADMIN_USER', 'deep-chokshi')
-ADMIN_PASS = os.environ.get('ADMIN_PASS', 'Deep@256114')
-FRONTEND_PORT = int(os.environ.get('FRONTEND_PORT', '5002'))
-FRONTEND_DEBUG = os.environ.get('FRONTEND_DEBUG', '0') == '1'
-RL_GYM_API_KEY = os.environ.get('RL_GYM_API_KEY')
-RL_GYM_BASE_URL = os.environ.get('RL_GYM_BASE_URL', 'https://rl-gym-advance.turing.com')
 
+# One persistent pool for dimension fan-out; sized for a few concurrent
+# requests so one evaluation's threads don't starve another's
+_DIM_POOL = ThreadPoolExecutor(max_workers=max(8, THREADS_PER_TASK * 4), thread_name_prefix='dim-eval')
+atexit.register(_DIM_POOL.shutdown)
 
-def _check_admin_auth() -> bool:
-    auth_header = request.headers.get('Authorization', '')
+ADMIN_USER = _env.get('ADMIN_USER', 'deep-chokshi')
+ADMIN_PASS = _env.get('ADMIN_PASS', 'Deep@256114')
+FRONTEND_PORT = int(_env.get('FRONTEND_PORT', '5002'))
+FRONTEND_DEBUG = _env.get('FRONTEND_DEBUG', '0') == '1'
+RL_GYM_API_KEY = _env.get('RL_GYM_API_KEY')
+RL_GYM_BASE_URL = _env.get('RL_GYM_BASE_URL', 'https://rl-gym-advance.turing.com')
+
+# Shared session so upstream fetches reuse keep-alive connections
+_rl_session = requests.Session()
+_rl_session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=64))
+_rl_session.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=64))
+
+
+_EXPECT_USER = ADMIN_USER.encode('utf-8')
+_EXPECT_PASS = ADMIN_PASS.encode('utf-8')
+
+
+@lru_cache(maxsize=256)
+def _auth_cached(auth_header: str) -> bool:
+    """Validate a Basic auth header; cached so repeat clients skip the decode."""
     if not auth_header.startswith('Basic '):
         return False
     try:
         encoded = auth_header.split(' ', 1)[1].strip()
         decoded = base64.b64decode(encoded).decode('utf-8')
         username, password = decoded.split(':', 1)
-        return username == ADMIN_USER and password == ADMIN_PASS
+        # Constant-time comparison so timing can't leak credential prefixes
+        return (hmac.compare_digest(username.encode('utf-8'), _EXPECT_USER)
+                and hmac.compare_digest(password.encode('utf-8'), _EXPECT_PASS))
     except Exception:
         return False
 
 
+def _check_admin_auth() -> bool:
+    return _auth_cached(request.headers.get('Authorization', ''))
+
+
 def _require_admin_auth():
     return Response(
         "Authentication required",
@@ -70,6 +131,35 @@ def _require_admin_auth():
     )
 
 
+# Process-wide evaluator; construction initializes the provider SDK client,
+# so do it once instead of per request
+_evaluator_singleton = None
+_evaluator_lock = threading.Lock()
+
+
+def _get_evaluator() -> QualityEvaluator:
+    """Return the shared QualityEvaluator, creating it on first use."""
+    global _evaluator_singleton
+    if _evaluator_singleton is None:
+        with _evaluator_lock:
+            if _evaluator_singleton is None:
+                _evaluator_singleton = QualityEvaluator()
+    return _evaluator_singleton
+
+
+def _evaluate_dimension_safe(evaluator: QualityEvaluator, dim_key: str, task_data: dict) -> dict:
+    """Evaluate one dimension, never raising, so one failure can't abort the map."""
+    try:
+        return evaluator.evaluate_quality_dimension(dim_key, task_data)
+    except Exception as e:
+        logger.error(f"Error evaluating {dim_key}: {e}")
+        return {
+            "dimension": dim_key,
+            "response": f"Evaluation error: {str(e)}",
+            "error": str(e)
+        }
+
+
 def evaluate_task_pair(
     config_data: dict,
     results_data: dict,
@@ -77,7 +167,7 @@ def evaluate_task_pair(
     reviewer_email: str = None
 ) -> dict:
     """Evaluate a config/results pair."""
-    evaluator = QualityEvaluator()
+    evaluator = _get_evaluator()
     
     # Create temp files or pass data directly
     task_data = {
@@ -111,25 +201,19 @@ def evaluate_task_pair(
             }
             results["Model Benchmarking Analysis"] = "Skipped"
     
-    with ThreadPoolExecutor(max_workers=THREADS_PER_TASK) as executor:
-        future_to_dim = {
-            executor.submit(evaluator.evaluate_quality_dimension, dim_key, task_data): dim_key
-            for dim_key in dimensions_to_run
+    eval_results = _DIM_POOL.map(
+        _evaluate_dimension_safe,
+        repeat(evaluator), dimensions_to_run, repeat(task_data)
+    )
+
+    for dim_key, eval_result in zip(dimensions_to_run, eval_results):
+        dim_name = QUALITY_DIMENSIONS[dim_key]["name"]
+        results["evaluation_results"][dim_name] = {
+            "response": eval_result.get("response", ""),
+            "error": eval_result.get("error")
         }
-        
-        for future in as_completed(future_to_dim):
-            dim_key = future_to_dim[future]
-            try:
-                eval_result = future.result()
-                dim_name = QUALITY_DIMENSIONS[dim_key]["name"]
-                results["evaluation_results"][dim_name] = {
-                    "response": eval_result.get("response", ""),
-                    "error": eval_result.get("error")
-                }
-                results[dim_name] = eval_result.get("response", "")
-                logger.info(f"✓ Completed: {dim_name}")
-            except Exception as e:
-                logger.error(f"Error evaluating {dim_key}: {e}")
+        results[dim_name] = eval_result.get("response", "")
+        logger.info(f"✓ Completed: {dim_name}")
     
     return results
 
@@ -138,40 +222,105 @@ def _require_api_key():
     return jsonify({"error": "RL_GYM_API_KEY is not set on the server"}), 500
 
 
-def _proxy_rl_gym(path: str) -> Response:
+# Short-TTL cache of upstream task fetches, so reviewers iterating on
+# one task don't re-download identical config/results every time
+_TASK_CACHE_TTL = 60
+_TASK_CACHE_MAX = 512
+_task_fetch_cache = {}  # (kind, task_id) -> (expires_at, response)
+_task_cache_lock = threading.Lock()
+
+
+def _fetch_task_resource(kind: str, task_id: str):
+    """Fetch a task's config or results from RL-gym with a short TTL cache.
+
+    kind is 'config' or 'download' (the upstream route suffix).
+    Only 200 responses are cached.
+    """
+    key = (kind, task_id)
+    now = time.monotonic()
+
+    with _task_cache_lock:
+        entry = _task_fetch_cache.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+
+    resp = _rl_session.get(
+        f"{RL_GYM_BASE_URL}/api/tasks/{task_id}/{kind}",
+        headers={"Authorization": f"Bearer {RL_GYM_API_KEY}"},
+        timeout=30
+    )
+
+    if resp.status_code == 200:
+        with _task_cache_lock:
+            if len(_task_fetch_cache) >= _TASK_CACHE_MAX:
+                _task_fetch_cache.clear()
+            _task_fetch_cache[key] = (now + _TASK_CACHE_TTL, resp)
+
+    return resp
+
+
+def _proxy_rl_gym(kind: str, task_id: str) -> Response:
     if not RL_GYM_API_KEY:
         return _require_api_key()
-    url = f"{RL_GYM_BASE_URL}{path}"
-    headers = {"Authorization": f"Bearer {RL_GYM_API_KEY}"}
     try:
-        resp = requests.get(url, headers=headers, timeout=30)
+        resp = _fetch_task_resource(kind, task_id)
         return Response(resp.content, status=resp.status_code, content_type=resp.headers.get('Content-Type'))
     except requests.RequestException as exc:
         return jsonify({"error": f"Upstream request failed: {exc}"}), 502
 
 
 def save_result(result: dict):
-    """Save result to JSON file."""
-    os.makedirs(os.path.dirname(RESULTS_JSON), exist_ok=True)
-    
-    existing = []
-    if os.path.exists(RESULTS_JSON) and os.path.getsize(RESULTS_JSON) > 0:
+    """Append result to the JSONL file (one JSON object per line)."""
+    os.makedirs(os.path.dirname(RESULTS_JSONL), exist_ok=True)
+
+    line = _json_dumps(result) + '\n'
+    with open(RESULTS_JSONL, 'a') as f:
+        # Serialize concurrent writers so lines never interleave
+        fcntl.flock(f, fcntl.LOCK_EX)
         try:
-            with open(RESULTS_JSON, 'r') as f:
-                existing = json.load(f)
-        except:
-            existing = []
-    
-    existing.append(result)
-    
-    with open(RESULTS_JSON, 'w') as f:
-        json.dump(existing, f, indent=2)
+            f.write(line)
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def iter_results(path: str = None):
+    """Stream results from the JSONL file, one parsed object per line."""
+    path = path or RESULTS_JSONL
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield _json_loads(line)
+
+
+# Parsed-results cache keyed on (mtime_ns, size) per path; appends from
+# save_result bump the mtime, which invalidates the entry automatically.
+_history_cache = {}
+_history_cache_lock = threading.Lock()
+
+
+def _load_results_cached(path: str = None) -> list:
+    """Return the parsed results list, re-reading only when the file changed."""
+    path = path or RESULTS_JSONL
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+
+    with _history_cache_lock:
+        entry = _history_cache.get(path)
+        if entry and entry[0] == key:
+            return entry[1]
+
+        results = list(iter_results(path))
+        _history_cache[path] = (key, results)
+        return results
 
 
 @app.route('/')
 def index():
     """Serve main page."""
-    return send_from_directory(os.path.dirname(os.path.abspath(__file__)), 'index.html')
+    resp = send_from_directory(os.path.dirname(os.path.abspath(__file__)), 'index.html')
+    resp.headers['Cache-Control'] = 'public, max-age=300'
+    return resp
 
 
 @app.route('/admin')
@@ -179,7 +328,10 @@ def admin():
     """Serve admin page (basic auth protected)."""
     if not _check_admin_auth():
         return _require_admin_auth()
-    return send_from_directory(os.path.dirname(os.path.abspath(__file__)), 'admin.html')
+    resp = send_from_directory(os.path.dirname(os.path.abspath(__file__)), 'admin.html')
+    # Auth-protected page; never let shared caches or the browser keep it
+    resp.headers['Cache-Control'] = 'no-store'
+    return resp
 
 
 @app.route('/api/health')
@@ -203,18 +355,29 @@ def get_dimensions():
     return jsonify({"dimensions": dims})
 
 
+# Sorted environments list cached against the tools directory's mtime
+_env_cache = {'key': None, 'val': ()}
+
+
 @app.route('/api/environments')
 def get_environments():
     """Return list of available tool environments."""
     tools_dir = os.path.join(PROJECT_ROOT, 'tools')
-    envs = []
-    
-    if os.path.exists(tools_dir):
-        for f in os.listdir(tools_dir):
-            if f.endswith('.json'):
-                envs.append(os.path.splitext(f)[0])
-                
-    return jsonify({"environments": sorted(envs)})
+
+    try:
+        mtime = os.stat(tools_dir).st_mtime_ns
+    except FileNotFoundError:
+        return jsonify({"environments": []})
+
+    if _env_cache['key'] != mtime:
+        _env_cache['val'] = tuple(sorted(
+            os.path.splitext(f)[0]
+            for f in os.listdir(tools_dir)
+            if f.endswith('.json')
+        ))
+        _env_cache['key'] = mtime
+
+    return jsonify({"environments": list(_env_cache['val'])})
 
 
 @app.route('/api/evaluate', methods=['POST'])
@@ -236,11 +399,12 @@ def evaluate():
         if results_file and not results_file.filename.endswith('.json'):
             return jsonify({"error": "Results file must be JSON"}), 400
         
-        # Parse files
-        config_data = json.loads(config_file.read().decode('utf-8'))
+        # Parse directly from the upload streams, avoiding a full
+        # bytes + decoded-str copy of each payload
+        config_data = json.load(io.TextIOWrapper(config_file.stream, encoding='utf-8'))
         results_data = {}
         if results_file:
-            results_data = json.loads(results_file.read().decode('utf-8'))
+            results_data = json.load(io.TextIOWrapper(results_file.stream, encoding='utf-8'))
         
         logger.info(f"Evaluating task: {config_data.get('task_id', 'unknown')}")
         
@@ -275,12 +439,12 @@ def evaluate():
 
 @app.route('/api/tasks/<task_id>/config')
 def fetch_task_config(task_id: str):
-    return _proxy_rl_gym(f"/api/tasks/{task_id}/config")
+    return _proxy_rl_gym('config', task_id)
 
 
 @app.route('/api/tasks/<task_id>/download')
 def fetch_task_results(task_id: str):
-    return _proxy_rl_gym(f"/api/tasks/{task_id}/download")
+    return _proxy_rl_gym('download', task_id)
 
 
 @app.route('/api/evaluate_task', methods=['POST'])
@@ -300,19 +464,16 @@ def evaluate_task_by_id():
         return jsonify({"error": "Reviewer email must be a @turing.com address"}), 400
 
     try:
-        config_resp = requests.get(
-            f"{RL_GYM_BASE_URL}/api/tasks/{task_id}/config",
-            headers={"Authorization": f"Bearer {RL_GYM_API_KEY}"},
-            timeout=30
-        )
+        # Config and results are independent; fetch them in parallel
+        # (each goes through the TTL cache)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            config_future = executor.submit(_fetch_task_resource, 'config', task_id)
+            results_future = executor.submit(_fetch_task_resource, 'download', task_id)
+            config_resp = config_future.result()
+            results_resp = results_future.result()
+
         if config_resp.status_code != 200:
             return jsonify({"error": f"Config fetch failed: {config_resp.text}"}), config_resp.status_code
-
-        results_resp = requests.get(
-            f"{RL_GYM_BASE_URL}/api/tasks/{task_id}/download",
-            headers={"Authorization": f"Bearer {RL_GYM_API_KEY}"},
-            timeout=30
-        )
         if results_resp.status_code != 200:
             return jsonify({"error": f"Results fetch failed: {results_resp.text}"}), results_resp.status_code
 
@@ -335,23 +496,24 @@ def evaluate_task_by_id():
 @app.route('/api/history')
 def get_history():
     """Get evaluation history."""
-    if not os.path.exists(RESULTS_JSON):
+    if not os.path.exists(RESULTS_JSONL):
         return jsonify({"history": []})
-    
+
     try:
-        with open(RESULTS_JSON, 'r') as f:
-            results = json.load(f)
-        
-        history = [
+        summaries = [
             {
-                "index": i,
                 "task_id": r.get("task_id"),
                 "reviewed_at": r.get("reviewed_at"),
                 "flags_count": len(r.get("detected_flags", []))
             }
-            for i, r in enumerate(reversed(results))
+            for r in _load_results_cached()
         ]
-        
+
+        history = [
+            {"index": i, **summary}
+            for i, summary in enumerate(reversed(summaries))
+        ]
+
         return jsonify({"history": history})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -360,13 +522,15 @@ def get_history():
 @app.route('/api/history/<int:index>')
 def get_history_entry(index):
     """Get specific history entry."""
+    if index < 0 or not os.path.exists(RESULTS_JSONL):
+        return jsonify({"error": "Not found"}), 404
+
     try:
-        with open(RESULTS_JSON, 'r') as f:
-            results = json.load(f)
-        
-        if index < 0 or index >= len(results):
+        results = _load_results_cached()
+
+        if index >= len(results):
             return jsonify({"error": "Not found"}), 404
-        
+
         return jsonify(results[index])
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -377,26 +541,73 @@ def admin_results():
     """Return evaluation results for admin view (basic auth protected)."""
     if not _check_admin_auth():
         return _require_admin_auth()
-    if not os.path.exists(RESULTS_JSON):
+    if not os.path.exists(RESULTS_JSONL):
         return jsonify({"results": []})
     try:
-        with open(RESULTS_JSON, 'r') as f:
-            results = json.load(f)
-        results = list(reversed(results))
-        return jsonify({"results": results})
+        results = _load_results_cached()
+
+        # Stream the payload instead of materializing one multi-MB string
+        def generate():
+            yield '{"results":['
+            for i, r in enumerate(reversed(results)):
+                if i:
+                    yield ','
+                yield _json_dumps(r)
+            yield ']}'
+
+        return Response(stream_with_context(generate()), mimetype='application/json')
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/admin/cache/bust', methods=['POST'])
+def bust_llm_cache():
+    """Clear the on-disk LLM response cache (basic auth protected)."""
+    if not _check_admin_auth():
+        return _require_admin_auth()
+
+    removed = 0
+    try:
+        if os.path.isdir(LLM_CACHE_PATH):
+            for name in os.listdir(LLM_CACHE_PATH):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(LLM_CACHE_PATH, name))
+                    removed += 1
+        return jsonify({"cleared": removed})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @app.route('/api/download/json')
 def download_json():
-    """Download results JSON."""
-    if os.path.exists(RESULTS_JSON):
-        return send_file(RESULTS_JSON, mimetype='application/json', as_attachment=True)
-    return jsonify({"error": "No results"}), 404
+    """Download results as a JSON array, stream-converted from JSONL."""
+    if not os.path.exists(RESULTS_JSONL):
+        return jsonify({"error": "No results"}), 404
+
+    def generate():
+        yield '['
+        first = True
+        with open(RESULTS_JSONL, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if not first:
+                    yield ','
+                yield line
+                first = False
+        yield ']'
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/json',
+        headers={"Content-Disposition": "attachment; filename=results.json"}
+    )
 
 
 if __name__ == '__main__':
+    # Dev only — Flask's built-in server serializes requests.
+    # Production deployments should run `gunicorn ... wsgi:app` (see wsgi.py).
     if PROVIDER == 'google' and not GOOGLE_API_KEY:
         logger.warning("GOOGLE_API_KEY not set!")
     elif PROVIDER == 'openai' and not OPENAI_API_KEY:
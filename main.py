@@ -4,12 +4,13 @@ Batch processor for evaluating RL Tool Use Data Generation tasks
 """
 import os
 import sys
+import fcntl
 import json
 import csv
 import logging
-import glob
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import Dict, List, Any
 
 from dotenv import load_dotenv
@@ -17,11 +18,21 @@ load_dotenv()
 
 from config import (
     DATA_DIR, RESULTS_FILE, DETAILED_RESULTS_FILE, ERROR_LOG_FILE,
-    CSV_HEADERS, QUALITY_DIMENSIONS, TASKS_PER_PROCESS, THREADS_PER_TASK,
+    CSV_HEADERS, DIMENSION_NAMES, QUALITY_DIMENSIONS, TASKS_PER_PROCESS,
     PROVIDER, GOOGLE_API_KEY, OPENAI_API_KEY
 )
 from quality_evaluator import QualityEvaluator
 
+# orjson is optional but parses/serializes severalfold faster than stdlib json
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj)
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -36,34 +47,54 @@ logger = logging.getLogger(__name__)
 
 def find_task_pairs(data_dir: str) -> List[Dict[str, str]]:
     """Find matching config and results file pairs in the data directory."""
-    config_files = glob.glob(os.path.join(data_dir, "*_config.json"))
+    configs = {}
+    result_stems = set()
+
+    # One directory pass instead of glob + a stat call per results file
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith("_config.json"):
+                configs[name[:-len("_config.json")]] = entry.path
+            elif name.endswith("_results.json"):
+                result_stems.add(name[:-len("_results.json")])
+
     task_pairs = []
-    
-    for config_path in config_files:
-        # Derive results path from config path
-        results_path = config_path.replace("_config.json", "_results.json")
-        
-        if os.path.exists(results_path):
+    for stem, config_path in sorted(configs.items()):
+        if stem in result_stems:
             task_pairs.append({
                 "config_path": config_path,
-                "results_path": results_path
+                "results_path": os.path.join(data_dir, f"{stem}_results.json")
             })
         else:
             logger.warning(f"No matching results file for: {config_path}")
-    
+
     logger.info(f"Found {len(task_pairs)} task pairs in {data_dir}")
     return task_pairs
 
 
+# Per-process evaluator cache; workers in the process pool reuse one
+# instance instead of re-initializing the provider client per task
+_worker_evaluator = None
+
+
+def _get_evaluator() -> QualityEvaluator:
+    """Return this process's cached QualityEvaluator, creating it on first use."""
+    global _worker_evaluator
+    if _worker_evaluator is None:
+        _worker_evaluator = QualityEvaluator()
+    return _worker_evaluator
+
+
 def process_single_task(task_pair: Dict[str, str]) -> Dict[str, Any]:
     """Process a single task with all quality dimensions."""
     try:
         config_path = task_pair["config_path"]
         results_path = task_pair["results_path"]
-        
+
         logger.info(f"Processing: {os.path.basename(config_path)}")
-        
-        evaluator = QualityEvaluator()
+
+        evaluator = _get_evaluator()
         results = evaluator.evaluate_task(config_path, results_path)
         
         logger.info(f"Completed: {results.get('task_id')}")
@@ -79,17 +110,6 @@ def process_single_task(task_pair: Dict[str, str]) -> Dict[str, Any]:
         }
 
 
-def process_task_batch(task_pairs: List[Dict[str, str]]) -> List[Dict[str, Any]]:
-    """Process a batch of tasks using threading for quality dimensions."""
-    batch_results = []
-    
-    for task_pair in task_pairs:
-        result = process_single_task(task_pair)
-        batch_results.append(result)
-    
-    return batch_results
-
-
 class QualityEvaluationProcessor:
     """Main processor for batch evaluation of RL Tool Use tasks."""
     
@@ -98,24 +118,19 @@ class QualityEvaluationProcessor:
         self.results = []
         self.errors = []
     
-    def initialize_results_file(self):
-        """Initialize JSON results file."""
-        os.makedirs(os.path.dirname(DETAILED_RESULTS_FILE), exist_ok=True)
-        if not os.path.exists(DETAILED_RESULTS_FILE):
-            with open(DETAILED_RESULTS_FILE, 'w') as f:
-                json.dump([], f)
-    
     def append_result_to_json(self, result: Dict[str, Any]):
-        """Append a result to the JSON file."""
+        """Append a result to the JSONL file (one JSON object per line)."""
         try:
-            with open(DETAILED_RESULTS_FILE, 'r') as f:
-                existing = json.load(f)
-            
-            existing.append(result)
-            
-            with open(DETAILED_RESULTS_FILE, 'w') as f:
-                json.dump(existing, f, indent=2)
-        
+            os.makedirs(os.path.dirname(DETAILED_RESULTS_FILE), exist_ok=True)
+
+            with open(DETAILED_RESULTS_FILE, 'a') as f:
+                # Serialize concurrent writers so lines never interleave
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.write(_json_dumps(result) + '\n')
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
         except Exception as e:
             logger.error(f"Error saving result to JSON: {e}")
     
@@ -123,26 +138,25 @@ class QualityEvaluationProcessor:
         """Save evaluation results to CSV file."""
         try:
             os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
-            
-            with open(RESULTS_FILE, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=CSV_HEADERS)
-                writer.writeheader()
-                
-                for result in self.results:
-                    row = {
-                        "task_id": result.get("task_id", "unknown"),
-                        "config_file": result.get("config_file", ""),
-                        "results_file": result.get("results_file", ""),
-                        "reviewed_at": result.get("reviewed_at", "")
-                    }
-                    
-                    for dim_name in [qd["name"] for qd in QUALITY_DIMENSIONS.values()]:
-                        row[dim_name] = result.get(dim_name, "N/A")
-                    
-                    writer.writerow(row)
-            
+
+            rows = [
+                (
+                    result.get("task_id", "unknown"),
+                    result.get("config_file", ""),
+                    result.get("results_file", ""),
+                    result.get("reviewed_at", ""),
+                    *(result.get(dim_name, "N/A") for dim_name in DIMENSION_NAMES)
+                )
+                for result in self.results
+            ]
+
+            with open(RESULTS_FILE, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(CSV_HEADERS)
+                writer.writerows(rows)
+
             logger.info(f"Results saved to {RESULTS_FILE}")
-        
+
         except Exception as e:
             logger.error(f"Error saving CSV: {e}")
     
@@ -152,10 +166,7 @@ class QualityEvaluationProcessor:
         logger.info("Starting RLToolUseEval Quality Evaluation")
         logger.info(f"Provider: {PROVIDER}")
         logger.info("=" * 60)
-        
-        # Initialize
-        self.initialize_results_file()
-        
+
         # Find task pairs
         task_pairs = find_task_pairs(self.data_dir)
         
@@ -163,16 +174,22 @@ class QualityEvaluationProcessor:
             logger.error(f"No task pairs found in {self.data_dir}")
             return
         
-        # Process tasks
-        logger.info(f"Processing {len(task_pairs)} tasks...")
-        
-        for task_pair in task_pairs:
-            result = process_single_task(task_pair)
-            self.results.append(result)
-            self.append_result_to_json(result)
-            
-            if "error" in result:
-                self.errors.append(result)
+        # Process tasks in parallel; each worker builds its own QualityEvaluator
+        logger.info(f"Processing {len(task_pairs)} tasks across {TASKS_PER_PROCESS} processes...")
+
+        with ProcessPoolExecutor(max_workers=TASKS_PER_PROCESS) as pool:
+            futures = {
+                pool.submit(process_single_task, task_pair): task_pair
+                for task_pair in task_pairs
+            }
+
+            for future in as_completed(futures):
+                result = future.result()
+                self.results.append(result)
+                self.append_result_to_json(result)
+
+                if "error" in result:
+                    self.errors.append(result)
         
         # Save final results
         self.save_results_to_csv()
@@ -184,6 +201,36 @@ class QualityEvaluationProcessor:
         logger.info("=" * 60)
 
 
+def _existing_files(directory: str) -> set:
+    """Return the set of file names in a directory (empty if missing)."""
+    try:
+        return {entry.name for entry in os.scandir(directory)}
+    except FileNotFoundError:
+        return set()
+
+
+@lru_cache(maxsize=1)
+def find_missing_prompts() -> tuple:
+    """Find configured prompt files that don't exist on disk.
+
+    Scans each prompt directory once and checks by set lookup; cached so
+    repeated invocations of main() skip the stat calls entirely.
+    """
+    existing_by_type = {
+        "system_prompt_file": _existing_files("prompts/system"),
+        "agent_prompt_file": _existing_files("prompts/agent")
+    }
+
+    missing = []
+    for dim_config in QUALITY_DIMENSIONS.values():
+        for prompt_type, existing in existing_by_type.items():
+            path = dim_config[prompt_type]
+            if os.path.basename(path) not in existing:
+                missing.append(path)
+
+    return tuple(missing)
+
+
 def main():
     """Main entry point."""
     # Check API keys
@@ -193,15 +240,10 @@ def main():
     elif PROVIDER == 'openai' and not OPENAI_API_KEY:
         logger.error("OPENAI_API_KEY not set. Please set it in .env file.")
         return
-    
+
     # Check prompt files
-    missing_prompts = []
-    for dim_key, dim_config in QUALITY_DIMENSIONS.items():
-        for prompt_type in ["system_prompt_file", "agent_prompt_file"]:
-            path = dim_config[prompt_type]
-            if not os.path.exists(path):
-                missing_prompts.append(path)
-    
+    missing_prompts = find_missing_prompts()
+
     if missing_prompts:
         logger.warning("Missing prompt files:")
         for p in missing_prompts:
@@ -8,6 +8,9 @@ import os
 import json
 import argparse
 import logging
+import mmap
+import re
+import threading
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -22,6 +25,29 @@ load_dotenv(os.path.join(PROJECT_ROOT, '.env'))
 from quality_evaluator import QualityEvaluator
 from config import QUALITY_DIMENSIONS, THREADS_PER_TASK
 
+# orjson is optional but parses/serializes severalfold faster than stdlib json
+try:
+    import orjson
+
+    def _json_loads(data):
+        # orjson only accepts buffer objects such as mmap via memoryview
+        # (still zero-copy, unlike bytes(data))
+        if not isinstance(data, (str, bytes, bytearray, memoryview)):
+            data = memoryview(data)
+        return orjson.loads(data)
+
+    def _json_dumps_bytes(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_loads(data):
+        # stdlib json can't take buffer objects such as mmap directly
+        if not isinstance(data, (str, bytes, bytearray)):
+            data = bytes(data)
+        return json.loads(data)
+
+    def _json_dumps_bytes(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,18 +59,22 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Splitting on the separator class directly avoids the intermediate
+# copy that .replace('\n', ',') built before every split
+_TOOL_SEP = re.compile(r'[,\n]+')
+
+# JSONDecoder is stateless for raw_decode, so one shared instance saves
+# re-building its scanner closure on every trajectory parse
+_JSON_DECODER = json.JSONDecoder()
+
+
 def parse_tools_list(tools_str: str) -> List[str]:
     """Parse comma or newline-separated tools list into a list."""
     if not tools_str:
         return []
-    
+
     # Split by comma or newline, strip whitespace, filter empty strings
-    tools = []
-    for tool in tools_str.replace('\n', ',').split(','):
-        tool = tool.strip()
-        if tool:
-            tools.append(tool)
-    return tools
+    return [tool for tool in (part.strip() for part in _TOOL_SEP.split(tools_str)) if tool]
 
 
 def parse_golden_trajectory(trajectory_str: str) -> List[Dict[str, Any]]:
@@ -57,54 +87,53 @@ def parse_golden_trajectory(trajectory_str: str) -> List[Dict[str, Any]]:
     """
     if not trajectory_str:
         return []
-    
+
+    s = trajectory_str.strip()
+    if not s:
+        return []
+
+    # Fast path: a clean array or single object parses in one shot
+    # without the incremental raw_decode walk below
+    if s[0] in '[{':
+        try:
+            obj = _json_loads(s)
+        except ValueError:
+            pass  # concatenated objects or trailing text; stream-parse below
+        else:
+            if isinstance(obj, list):
+                return [item for item in obj if isinstance(item, dict)]
+            if isinstance(obj, dict):
+                return [obj] if ('name' in obj or 'tool_name' in obj) else []
+
     tools = []
     try:
-        # Try parsing as a single JSON object first
-        try:
-            tool_obj = json.loads(trajectory_str)
-            # Check if it's a tool object (has 'name' field) or a result object (has 'tool_name')
-            if 'name' in tool_obj or 'tool_name' in tool_obj:
-                tools.append(tool_obj)
-                return tools
-        except json.JSONDecodeError:
-            pass
-        
-        # Try splitting by newlines and parsing each as JSON
-        lines = trajectory_str.strip().split('\n')
-        current_obj = []
-        brace_count = 0
-        
-        for line in lines:
-            current_obj.append(line)
-            brace_count += line.count('{') - line.count('}')
-            
-            if brace_count == 0 and current_obj:
-                # Complete JSON object found
-                obj_str = '\n'.join(current_obj).strip()
-                if obj_str:
-                    try:
-                        tool_obj = json.loads(obj_str)
-                        if 'name' in tool_obj or 'tool_name' in tool_obj:
-                            tools.append(tool_obj)
-                    except json.JSONDecodeError:
-                        pass
-                current_obj = []
-        
-        # If we still have unclosed braces, try parsing the whole thing
-        if not tools and trajectory_str.strip():
+        # Single forward pass with raw_decode handles one object, an array,
+        # or several objects back to back — and unlike brace counting it is
+        # not confused by braces inside quoted strings
+        i, n = 0, len(trajectory_str)
+
+        while i < n:
+            # Skip whitespace between concatenated objects
+            while i < n and trajectory_str[i].isspace():
+                i += 1
+            if i >= n:
+                break
+
             try:
-                tool_obj = json.loads(trajectory_str.strip())
-                if isinstance(tool_obj, list):
-                    tools = tool_obj
-                elif isinstance(tool_obj, dict) and ('name' in tool_obj or 'tool_name' in tool_obj):
-                    tools = [tool_obj]
+                obj, i = _JSON_DECODER.raw_decode(trajectory_str, i)
             except json.JSONDecodeError:
                 logger.warning(f"Could not parse golden trajectory: {trajectory_str[:100]}...")
-    
+                break
+
+            if isinstance(obj, list):
+                tools.extend(item for item in obj if isinstance(item, dict))
+            elif isinstance(obj, dict) and ('name' in obj or 'tool_name' in obj):
+                # A tool object (has 'name') or a result object (has 'tool_name')
+                tools.append(obj)
+
     except Exception as e:
         logger.error(f"Error parsing golden trajectory: {e}")
-    
+
     return tools
 
 
@@ -134,41 +163,42 @@ def parse_verifiers(verifiers_str: str) -> List[Dict[str, Any]]:
     return verifiers
 
 
+# One compiled alternation instead of a substring scan per domain;
+# IGNORECASE also avoids allocating a lowercased copy of the filename
+_DOMAIN_RE = re.compile(r'paypal|slack|stripe|discord', re.IGNORECASE)
+
+
 def infer_domain_from_filename(filename: str) -> str:
     """Infer domain from filename."""
-    filename_lower = filename.lower()
-    if "paypal" in filename_lower:
-        return "paypal"
-    elif "slack" in filename_lower:
-        return "slack"
-    elif "stripe" in filename_lower:
-        return "stripe"
-    elif "discord" in filename_lower:
-        return "discord"
-    else:
-        return "paypal"  # Default
+    match = _DOMAIN_RE.search(filename)
+    return match.group(0).lower() if match else "paypal"  # Default
 
 
 def transform_task_to_config(task: Dict[str, Any], domain: str) -> Dict[str, Any]:
     """Transform a task from JSON format to config format expected by QualityEvaluator."""
+    # Bind repeated fields once instead of re-hashing the same keys
+    user_prompt = task.get("user_prompt", "")
+    system_prompt = task.get("system_prompt", "")
+
     # Parse tools list
     expected_tools = parse_tools_list(task.get("list_of_tools_used_human", ""))
-    
+
     # Parse golden trajectory
     tools = parse_golden_trajectory(task.get("new_golden_trajectory_human", ""))
-    
+
     # Parse verifiers
     verifier_configs = parse_verifiers(task.get("new_verifiers", ""))
-    
-    # Build config structure
-    config = {
+
+    # Build config structure in one literal so CPython emits BUILD_MAP
+    # with constant keys rather than per-key stores
+    return {
         "task_id": task.get("task_id", "unknown"),
-        "task_name": task.get("user_prompt", ""),
-        "description": task.get("user_prompt", ""),
-        "system_prompt": task.get("system_prompt", ""),
+        "task_name": user_prompt,
+        "description": user_prompt,
+        "system_prompt": system_prompt,
         "scenario_config": {
-            "prompt": task.get("user_prompt", ""),
-            "system_prompt": task.get("system_prompt", ""),
+            "prompt": user_prompt,
+            "system_prompt": system_prompt,
             "expected_tools": expected_tools,
             "selected_tools": [],
             "restricted_tools": []
@@ -176,8 +206,41 @@ def transform_task_to_config(task: Dict[str, Any], domain: str) -> Dict[str, Any
         "tools": tools,
         "verifier_configs": verifier_configs
     }
-    
-    return config
+
+
+# Process-wide evaluator shared across tasks; construction initializes the
+# provider SDK client, whose HTTP connection pool is then reused run-long
+_evaluator = None
+_evaluator_lock = threading.Lock()
+
+
+def _get_evaluator() -> QualityEvaluator:
+    """Return the shared QualityEvaluator, creating it on first use."""
+    global _evaluator
+    if _evaluator is None:
+        with _evaluator_lock:
+            if _evaluator is None:
+                _evaluator = QualityEvaluator()
+    return _evaluator
+
+
+# Shared per-dimension pool so each task doesn't spawn and tear down
+# THREADS_PER_TASK worker threads of its own
+_dimension_pool = None
+_dimension_pool_lock = threading.Lock()
+
+
+def _get_dimension_pool() -> ThreadPoolExecutor:
+    """Return the shared dimension-evaluation pool, creating it on first use."""
+    global _dimension_pool
+    if _dimension_pool is None:
+        with _dimension_pool_lock:
+            if _dimension_pool is None:
+                _dimension_pool = ThreadPoolExecutor(
+                    max_workers=THREADS_PER_TASK,
+                    thread_name_prefix='dim-eval'
+                )
+    return _dimension_pool
 
 
 def evaluate_task_pair(
@@ -186,7 +249,7 @@ def evaluate_task_pair(
     domain_override: str = None
 ) -> dict:
     """Evaluate a config/results pair - same logic as web interface."""
-    evaluator = QualityEvaluator()
+    evaluator = _get_evaluator()
     
     # Create task_data dictionary
     task_data = {
@@ -219,47 +282,85 @@ def evaluate_task_pair(
             }
             results["Model Benchmarking Analysis"] = "Skipped"
     
-    # Evaluate dimensions in parallel (same as web interface)
-    with ThreadPoolExecutor(max_workers=THREADS_PER_TASK) as executor:
-        future_to_dim = {
-            executor.submit(evaluator.evaluate_quality_dimension, dim_key, task_data): dim_key
-            for dim_key in dimensions_to_run
-        }
-        
-        for future in as_completed(future_to_dim):
-            dim_key = future_to_dim[future]
-            try:
-                eval_result = future.result()
-                dim_name = QUALITY_DIMENSIONS[dim_key]["name"]
-                results["evaluation_results"][dim_name] = {
-                    "response": eval_result.get("response", ""),
-                    "error": eval_result.get("error")
-                }
-                results[dim_name] = eval_result.get("response", "")
-                logger.info(f"✓ Completed: {dim_name} for {task_data['task_id']}")
-            except Exception as e:
-                logger.error(f"Error evaluating {dim_key} for {task_data['task_id']}: {e}")
-                dim_name = QUALITY_DIMENSIONS[dim_key]["name"]
-                results["evaluation_results"][dim_name] = {
-                    "response": f"Error: {str(e)}",
-                    "error": str(e)
-                }
+    # Prefer one combined LLM round-trip for all dimensions; fall back to
+    # the per-dimension fan-out when the batched response doesn't parse
+    batch_results = evaluator.evaluate_dimensions_batch(dimensions_to_run, task_data)
+    if batch_results is not None:
+        for dim_key in dimensions_to_run:
+            eval_result = batch_results[dim_key]
+            dim_name = QUALITY_DIMENSIONS[dim_key]["name"]
+            results["evaluation_results"][dim_name] = {
+                "response": eval_result.get("response", ""),
+                "error": eval_result.get("error")
+            }
+            results[dim_name] = eval_result.get("response", "")
+            logger.info(f"✓ Completed: {dim_name} for {task_data['task_id']} (batched)")
+        return results
+
+    # Evaluate dimensions in parallel on the shared pool (same as web interface)
+    executor = _get_dimension_pool()
+    future_to_dim = {
+        executor.submit(evaluator.evaluate_quality_dimension, dim_key, task_data): dim_key
+        for dim_key in dimensions_to_run
+    }
+
+    for future in as_completed(future_to_dim):
+        dim_key = future_to_dim[future]
+        try:
+            eval_result = future.result()
+            dim_name = QUALITY_DIMENSIONS[dim_key]["name"]
+            results["evaluation_results"][dim_name] = {
+                "response": eval_result.get("response", ""),
+                "error": eval_result.get("error")
+            }
+            results[dim_name] = eval_result.get("response", "")
+            logger.info(f"✓ Completed: {dim_name} for {task_data['task_id']}")
+        except Exception as e:
+            logger.error(f"Error evaluating {dim_key} for {task_data['task_id']}: {e}")
+            dim_name = QUALITY_DIMENSIONS[dim_key]["name"]
+            results["evaluation_results"][dim_name] = {
+                "response": f"Error: {str(e)}",
+                "error": str(e)
+            }
     
     return results
 
 
-def process_batch(json_file_path: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+def _process_single_batch_task(task: Dict[str, Any], domain: str) -> Dict[str, Any]:
+    """Transform and evaluate one task from the batch."""
+    # Transform task to config format
+    config_data = transform_task_to_config(task, domain)
+
+    # Create empty results (no model runs available)
+    results_data = {
+        "results": [],
+        "task_metadata": {}
+    }
+
+    # Evaluate task
+    return evaluate_task_pair(config_data, results_data, domain_override=domain)
+
+
+def process_batch(json_file_path: str, limit: Optional[int] = None,
+                  task_concurrency: int = 4) -> List[Dict[str, Any]]:
     """Process a batch of tasks from a JSON file."""
     logger.info(f"Loading tasks from: {json_file_path}")
     
-    # Load JSON file
+    # Load JSON file via memory-map so the OS pages bytes in directly
+    # instead of copying the whole file through a read() buffer
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            tasks = json.load(f)
+        with open(json_file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    tasks = _json_loads(mm)
+            else:
+                # Empty files can't be mapped; let the parser report it
+                tasks = _json_loads(b'')
     except FileNotFoundError:
         logger.error(f"File not found: {json_file_path}")
         return []
-    except json.JSONDecodeError as e:
+    except ValueError as e:
+        # Covers json.JSONDecodeError and orjson.JSONDecodeError alike
         logger.error(f"Invalid JSON file: {e}")
         return []
     
@@ -278,36 +379,33 @@ def process_batch(json_file_path: str, limit: Optional[int] = None) -> List[Dict
     domain = infer_domain_from_filename(os.path.basename(json_file_path))
     logger.info(f"Inferred domain: {domain}")
     
-    # Process each task
-    results = []
+    # Process tasks concurrently; each evaluation is dominated by LLM I/O,
+    # so tasks overlap while the shared dimension pool bounds total threads
+    results_by_index = {}
     errors = []
-    
-    for i, task in enumerate(tasks, 1):
-        task_id = task.get("task_id", f"task_{i}")
-        logger.info(f"[{i}/{len(tasks)}] Processing task: {task_id}")
-        
-        try:
-            # Transform task to config format
-            config_data = transform_task_to_config(task, domain)
-            
-            # Create empty results (no model runs available)
-            results_data = {
-                "results": [],
-                "task_metadata": {}
-            }
-            
-            # Evaluate task
-            eval_result = evaluate_task_pair(config_data, results_data, domain_override=domain)
-            results.append(eval_result)
-            
-            logger.info(f"✓ Completed task: {task_id}")
-        
-        except Exception as e:
-            logger.error(f"Error processing task {task_id}: {e}")
-            errors.append({
-                "task_id": task_id,
-                "error": str(e)
-            })
+
+    with ThreadPoolExecutor(max_workers=task_concurrency, thread_name_prefix='batch-task') as executor:
+        future_to_task = {
+            executor.submit(_process_single_batch_task, task, domain): (i, task)
+            for i, task in enumerate(tasks, 1)
+        }
+
+        for future in as_completed(future_to_task):
+            i, task = future_to_task[future]
+            task_id = task.get("task_id", f"task_{i}")
+
+            try:
+                results_by_index[i] = future.result()
+                logger.info(f"✓ [{i}/{len(tasks)}] Completed task: {task_id}")
+            except Exception as e:
+                logger.error(f"Error processing task {task_id}: {e}")
+                errors.append({
+                    "task_id": task_id,
+                    "error": str(e)
+                })
+
+    # Preserve input order in the saved results
+    results = [results_by_index[i] for i in sorted(results_by_index)]
     
     if errors:
         logger.warning(f"Encountered {len(errors)} errors during processing")
@@ -328,11 +426,17 @@ def save_results(results: List[Dict[str, Any]], input_file_path: str):
     output_filename = f"{input_name}_results_{timestamp}.json"
     output_path = os.path.join(input_dir, output_filename)
     
-    # Save results
+    # Save results, framing the array record by record so the full
+    # serialized output never has to sit in memory at once
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        
+        with open(output_path, 'wb') as f:
+            f.write(b'[\n')
+            for i, result in enumerate(results):
+                if i:
+                    f.write(b',\n')
+                f.write(_json_dumps_bytes(result))
+            f.write(b'\n]\n')
+
         logger.info(f"Results saved to: {output_path}")
         logger.info(f"Total tasks evaluated: {len(results)}")
         return output_path
@@ -357,7 +461,13 @@ def main():
         default=None,
         help="Limit the number of tasks to evaluate (e.g., -n 10 for first 10 tasks)"
     )
-    
+    parser.add_argument(
+        "-c", "--task-concurrency",
+        type=int,
+        default=4,
+        help="Number of tasks to evaluate concurrently (default: 4)"
+    )
+
     args = parser.parse_args()
     
     # Validate file exists
@@ -366,7 +476,7 @@ def main():
         sys.exit(1)
     
     # Process batch
-    results = process_batch(args.json_file, limit=args.limit)
+    results = process_batch(args.json_file, limit=args.limit, task_concurrency=args.task_concurrency)
     
     if not results:
         logger.error("No results to save")
@@ -23,11 +23,16 @@ TRAJECTORY_DIR = PROJECT_ROOT / "data" / "trajectories"
 
 def is_trajectory_file_path(value: str) -> bool:
     """Check if the value is a trajectory file path (ends with .json and doesn't start with { or [)."""
-    if not isinstance(value, str):
+    # Cheap suffix test first; most non-paths are large JSON bodies
+    if not isinstance(value, str) or not value.endswith('.json'):
         return False
-    
-    # Check if it's a filename (ends with .json) and doesn't look like JSON content
-    return value.endswith('.json') and not value.strip().startswith(('{', '['))
+
+    # Look at the first non-whitespace character directly instead of
+    # allocating a stripped copy of a potentially multi-KB string
+    for ch in value:
+        if not ch.isspace():
+            return ch not in '{['
+    return False
 
 
 def load_trajectory_file(filename: str) -> str:
@@ -40,22 +45,36 @@ def load_trajectory_file(filename: str) -> str:
         return f.read()
 
 
+# Templated datasets repeat identical trajectory/tool strings across many
+# rows; caching by the raw string makes duplicates parse once
+_tools_used_cache = {}
+_trajectory_cache = {}
+
+# JSONDecoder is stateless for raw_decode, so one shared instance saves
+# re-building its scanner closure on every trajectory parse
+_JSON_DECODER = json.JSONDecoder()
+
+
 def parse_tools_used(value) -> list:
     """Parse tools_used field from newline-separated string to list."""
     if not value or pd.isna(value):
         return []
     if isinstance(value, str):
-        # Split by newline, strip whitespace, filter empty strings
-        tools = [tool.strip() for tool in value.split('\n') if tool.strip()]
-        return tools
+        cached = _tools_used_cache.get(value)
+        if cached is None:
+            # Split by newline, strip whitespace, filter empty strings
+            cached = [tool.strip() for tool in value.split('\n') if tool.strip()]
+            _tools_used_cache[value] = cached
+        # Copy so callers can't mutate the cached list
+        return list(cached)
     return []
 
 
 def parse_golden_trajectory(value) -> list:
     """Parse golden_trajectory field from JSON string to structured data.
-    
+
     Always returns a list, even for single objects.
-    
+
     Handles:
     - Single JSON object (returns [dict])
     - JSON array (returns list of dicts)
@@ -64,11 +83,21 @@ def parse_golden_trajectory(value) -> list:
     """
     if not value or pd.isna(value):
         return []
-    
+
     # Convert to string if not already
     if not isinstance(value, str):
         value = str(value)
-    
+
+    cached = _trajectory_cache.get(value)
+    if cached is None:
+        cached = _parse_golden_trajectory_uncached(value)
+        _trajectory_cache[value] = cached
+    # Copy so callers can't mutate the cached list
+    return list(cached)
+
+
+def _parse_golden_trajectory_uncached(value: str) -> list:
+    """Do the actual trajectory parsing for a cache miss."""
     # If it's a file path, load the actual content first
     if is_trajectory_file_path(value):
         trajectory_filename = value
@@ -80,52 +109,49 @@ def parse_golden_trajectory(value) -> list:
         except Exception as e:
             print(f"Error loading {trajectory_filename}: {e}")
     
-    # Try to parse as single JSON object or array first
-    try:
-        parsed = json.loads(value)
-        # If it's a list, filter to only dict elements
-        if isinstance(parsed, list):
-            return [item for item in parsed if isinstance(item, dict)]
-        # If it's a dict, wrap it in a list
-        elif isinstance(parsed, dict):
-            return [parsed]
-        else:
-            # If it's neither list nor dict, return empty list
-            return []
-    except (json.JSONDecodeError, TypeError):
-        # If single JSON parsing fails, try parsing as JSONL (multiple JSON objects)
+    # Fast path: a clean array or single object parses in one shot
+    # without the incremental raw_decode walk below
+    s = value.strip()
+    if s[:1] in ('[', '{'):
         try:
-            lines = value.strip().split('\n')
-            parsed_objects = []
-            current_obj = []
-            brace_count = 0
-            
-            for line in lines:
-                current_obj.append(line)
-                # Track opening and closing braces to identify complete JSON objects
-                brace_count += line.count('{') - line.count('}')
-                
-                # When brace_count reaches 0, we have a complete JSON object
-                if brace_count == 0 and current_obj:
-                    obj_str = '\n'.join(current_obj).strip()
-                    if obj_str:
-                        try:
-                            obj = json.loads(obj_str)
-                            if isinstance(obj, dict):
-                                parsed_objects.append(obj)
-                        except json.JSONDecodeError:
-                            # Skip invalid JSON objects
-                            pass
-                    current_obj = []
-            
-            # Return list of parsed objects (even if empty or single)
-            return parsed_objects
-        except Exception:
-            # If JSONL parsing fails, return empty list
-            pass
-    
-    # If all parsing fails, return empty list
-    return []
+            obj = json.loads(s)
+        except json.JSONDecodeError:
+            pass  # concatenated objects or trailing text; stream-parse below
+        else:
+            if isinstance(obj, list):
+                return [item for item in obj if isinstance(item, dict)]
+            return [obj] if isinstance(obj, dict) else []
+
+    # Single forward pass with raw_decode handles a JSON object, a JSON
+    # array, or several objects back to back (JSONL format) — and unlike
+    # brace counting it is not confused by braces inside quoted strings
+    try:
+        parsed_objects = []
+        i, n = 0, len(value)
+
+        while i < n:
+            # Skip whitespace between concatenated objects
+            while i < n and value[i].isspace():
+                i += 1
+            if i >= n:
+                break
+
+            try:
+                obj, i = _JSON_DECODER.raw_decode(value, i)
+            except json.JSONDecodeError:
+                # Stop at the first invalid chunk; keep whatever parsed
+                break
+
+            # If it's a list, keep only dict elements; scalars are dropped
+            if isinstance(obj, list):
+                parsed_objects.extend(item for item in obj if isinstance(item, dict))
+            elif isinstance(obj, dict):
+                parsed_objects.append(obj)
+
+        return parsed_objects
+    except Exception:
+        # If all parsing fails, return empty list
+        return []
 
 
 def parse_verifiers(value) -> list:
@@ -142,9 +168,6 @@ def parse_verifiers(value) -> list:
 # Read CSV and convert to JSON
 tasks = []
 
-# Read CSV using pandas
-df = pd.read_csv(CSV_FILE, encoding='utf-8')
-
 # Assert required columns exist
 required_columns = [
     'NEW TASK ID',
@@ -156,6 +179,16 @@ required_columns = [
     'NEW VERIFIERS'
 ]
 
+# Only parse the columns we actually consume; delivery sheets carry many
+# extra columns that would otherwise be tokenized and boxed per row
+_WANTED_COLUMNS = set(required_columns) | {
+    'Expected # Tool Calls\n(Human)',
+    'Expected # Tool Calls (Human)'
+}
+
+# Read CSV using pandas
+df = pd.read_csv(CSV_FILE, encoding='utf-8', usecols=lambda c: c in _WANTED_COLUMNS)
+
 for col in required_columns:
     assert col in df.columns, f"Missing '{col}' column"
 
@@ -167,48 +200,65 @@ elif 'Expected # Tool Calls (Human)' in df.columns:
     expected_tool_calls_col = 'Expected # Tool Calls (Human)'
 has_expected_tool_calls = expected_tool_calls_col is not None
 
-# Iterate through DataFrame rows
+# Validate in one vectorized pass instead of per-row pd.notna asserts.
+# Only the identity columns are mandatory; tools/trajectory/verifiers may
+# legitimately be empty and are handled by the parse helpers.
+_MANDATORY_COLUMNS = ['NEW TASK ID', 'Prompt', 'Persona', 'Category']
+_bad_rows = df[_MANDATORY_COLUMNS].isna().any(axis=1)
+assert not _bad_rows.any(), f"Rows with missing required fields: {df.index[_bad_rows].tolist()}"
+
+_task_id_series = df['NEW TASK ID'].astype(str).str.strip()
+_empty_ids = _task_id_series == ''
+assert not _empty_ids.any(), f"Empty NEW TASK ID in rows: {df.index[_empty_ids].tolist()}"
+
+# Pull each column out once and zip plain lists; df.iterrows() boxes
+# every row into a Series, which dominates runtime on large CSVs
+task_id_col = _task_id_series.tolist()
+prompt_col = df['Prompt'].tolist()
+persona_col = df['Persona'].tolist()
+category_col = df['Category'].tolist()
+tools_used_col = df['List of Tools Used\n(Human)'].tolist()
+trajectory_col = df['New Golden Trajectory \n(Human)'].tolist()
+verifiers_col = df['NEW VERIFIERS'].tolist()
+if has_expected_tool_calls:
+    expected_count_col = df[expected_tool_calls_col].tolist()
+else:
+    expected_count_col = [None] * len(df)
+
 validation_flags = []
-for idx, row in df.iterrows():
-    # Assert values are not None/NaN
-    assert pd.notna(row['NEW TASK ID']) and str(row['NEW TASK ID']).strip() != '', f"Empty NEW TASK ID in row {idx}"
-    assert pd.notna(row['Prompt']), f"Empty Prompt in row {idx}"
-    assert pd.notna(row['Persona']), f"Empty Persona in row {idx}"
-    assert pd.notna(row['Category']), f"Empty Category in row {idx}"
-    
+for idx, (task_id, prompt, persona, category, tools_raw, trajectory_raw, verifiers_raw, expected_count) in enumerate(
+        zip(task_id_col, prompt_col, persona_col, category_col,
+            tools_used_col, trajectory_col, verifiers_col, expected_count_col)):
     # Parse fields using helper functions
-    tools_used = parse_tools_used(row['List of Tools Used\n(Human)'])
-    golden_trajectory = parse_golden_trajectory(row['New Golden Trajectory \n(Human)'])
-    verifiers = parse_verifiers(row['NEW VERIFIERS'])
-    
+    tools_used = parse_tools_used(tools_raw)
+    golden_trajectory = parse_golden_trajectory(trajectory_raw)
+    verifiers = parse_verifiers(verifiers_raw)
+
     # Validate golden_trajectory count matches expected tool calls
-    if has_expected_tool_calls:
-        expected_count = row[expected_tool_calls_col]
-        if pd.notna(expected_count):
-            try:
-                expected_count = int(float(expected_count))  # Handle both int and float strings
-                actual_count = len(golden_trajectory)
-                if actual_count != expected_count:
-                    task_id = str(row['NEW TASK ID']).strip()
-                    validation_flags.append(
-                        f"⚠️  FLAG: Row {idx} (Task ID: {task_id}) - "
-                        f"Expected {expected_count} tool calls, but golden_trajectory has {actual_count} elements"
-                    )
-            except (ValueError, TypeError):
-                # If expected_count can't be converted to int, skip validation for this row
-                pass
-    
+    if has_expected_tool_calls and pd.notna(expected_count):
+        try:
+            expected_count = int(float(expected_count))  # Handle both int and float strings
+            actual_count = len(golden_trajectory)
+            if actual_count != expected_count:
+                validation_flags.append(
+                    f"⚠️  FLAG: Row {idx} (Task ID: {task_id}) - "
+                    f"Expected {expected_count} tool calls, but golden_trajectory has {actual_count} elements"
+                )
+        except (ValueError, TypeError):
+            # If expected_count can't be converted to int, skip validation for this row
+            pass
+
     task = {
-        "task_id": str(row['NEW TASK ID']).strip(),
+        "task_id": task_id,
         "system_prompt": SYSTEM_PROMPT,
-        "user_prompt": str(row['Prompt']),
-        "persona": str(row['Persona']),
-        "category": str(row['Category']),
+        "user_prompt": str(prompt),
+        "persona": str(persona),
+        "category": str(category),
         "tools_used": tools_used,
         "golden_trajectory": golden_trajectory,
         "verifiers": verifiers
     }
-    
+
     tasks.append(task)
 
 # Assert we have at least one task
@@ -241,20 +291,20 @@ folder_name = Path(OUTPUT_FILE).stem  # e.g., "paypal_delivery_task_sample"
 output_folder = PROJECT_ROOT / "data" / folder_name
 output_folder.mkdir(exist_ok=True)
 
-with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+# compresslevel=1 cuts deflate CPU several-fold for near-identical ratios
+# on these small JSON files
+with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
     for task in tasks:
         task_id = task['task_id']
         filename = f"{folder_name}/{task_id}.json"
-        # Convert task to JSON string
-        task_json = json.dumps(task, indent=2, ensure_ascii=False)
-        
+        # Serialize once and reuse the bytes for both destinations
+        task_bytes = json.dumps(task, indent=2, ensure_ascii=False).encode('utf-8')
+
         # Write to disk folder
-        task_file_path = output_folder / f"{task_id}.json"
-        with open(task_file_path, 'w', encoding='utf-8') as f:
-            f.write(task_json)
-        
+        (output_folder / f"{task_id}.json").write_bytes(task_bytes)
+
         # Add to zip file with folder path
-        zipf.writestr(filename, task_json)
+        zipf.writestr(filename, task_bytes)
 
 print(f"Successfully created folder '{folder_name}/' with {len(tasks)} task files")
 print(f"Successfully created zip file with {len(tasks)} task files in '{folder_name}/' folder: {ZIP_OUTPUT_FILE}")
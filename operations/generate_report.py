@@ -1,54 +1,156 @@
 import pandas as pd
+import functools
 import json
-from collections import defaultdict
+import logging
 import os
 import shutil
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+# Per-task debug output is opt-in; an unconditional print in the hot
+# loop costs a formatted stdio write per row
+_DEBUG = os.environ.get('DIVERSITY_DEBUG') == '1'
+
+# Below this many tasks, process-pool startup costs more than it saves
+_PARALLEL_THRESHOLD = 1000
+
+# orjson is optional but parses JSON severalfold faster than stdlib json
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+# xlsxwriter in constant_memory mode flushes rows as they are written
+# instead of holding the whole workbook in memory like openpyxl
+try:
+    import xlsxwriter  # noqa: F401
+
+    _EXCEL_WRITER_KWARGS = {
+        'engine': 'xlsxwriter',
+        'engine_kwargs': {'options': {'constant_memory': True}}
+    }
+except ImportError:
+    _EXCEL_WRITER_KWARGS = {'engine': 'openpyxl'}
+
 # Get project root directory (parent of operations directory)
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 TRAJECTORY_DIR = PROJECT_ROOT / "data" / "trajectories"
 
+# Compiled once at import so the hot loop skips the re-cache lookup and
+# pattern re-parse on every trajectory
+_TOOL_NAME_RE = re.compile(r'"tool_name"\s*:\s*"([^"]+)"')
+
 
 def is_trajectory_file_path(value: str) -> bool:
     """Check if the value is a trajectory file path (ends with .json and doesn't start with { or [)."""
-    if not isinstance(value, str):
+    # Cheap suffix test first; most non-paths are large JSON bodies
+    if not isinstance(value, str) or not value.endswith('.json'):
         return False
-    
-    # Check if it's a filename (ends with .json) and doesn't look like JSON content
-    return value.endswith('.json') and not value.strip().startswith(('{', '['))
 
+    # Look at the first non-whitespace character directly instead of
+    # allocating a stripped copy of a potentially multi-KB string
+    for ch in value:
+        if not ch.isspace():
+            return ch not in '{['
+    return False
+
+
+@functools.lru_cache(maxsize=1)
+def _available_trajectory_files() -> frozenset:
+    """List the trajectory directory once; existence checks become set lookups."""
+    try:
+        with os.scandir(TRAJECTORY_DIR) as entries:
+            return frozenset(entry.name for entry in entries)
+    except FileNotFoundError:
+        return frozenset()
 
+
+# Templated sheets reuse the same trajectory file across many rows;
+# memoizing turns N duplicate reads into one per unique filename
+@functools.lru_cache(maxsize=2048)
 def load_trajectory_file(filename: str) -> str:
     """Load trajectory file content as text from data/trajectories/ directory."""
-    file_path = TRAJECTORY_DIR / filename
-    if not file_path.exists():
-        raise FileNotFoundError(f"Trajectory file not found: {file_path}")
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
+    # Set lookup against one directory scan instead of a stat per row
+    if filename not in _available_trajectory_files():
+        raise FileNotFoundError(f"Trajectory file not found: {TRAJECTORY_DIR / filename}")
+
+    with open(TRAJECTORY_DIR / filename, 'r', encoding='utf-8') as f:
         return f.read()
 
 
+def _extract_tool_names_from_obj(obj) -> list:
+    """Collect tool_name values from parsed trajectory data, in order.
+
+    Walks nested lists/dicts iteratively so deep trajectories can't blow
+    the recursion limit.
+    """
+    tool_names = []
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            tool_name = current.get('tool_name')
+            if isinstance(tool_name, str):
+                tool_names.append(tool_name)
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+    return tool_names
+
+
 def extract_tool_names_from_trajectory(golden_trajectory_str: str) -> list:
     """
-    Extract all tool names from golden_trajectory JSON string using regex.
-    
+    Extract all tool names from golden_trajectory JSON string.
+
     Args:
         golden_trajectory_str: JSON string containing tool calls
-        
+
     Returns:
         List of tool names in order of appearance
     """
     if not golden_trajectory_str or not isinstance(golden_trajectory_str, str):
         return []
-    
-    # Regex pattern to match "tool_name": "tool_name_value"
-    pattern = r'"tool_name"\s*:\s*"([^"]+)"'
-    matches = re.findall(pattern, golden_trajectory_str)
-    
-    return matches
+
+    # Parse once and walk the structure: one C-level tokenize instead of
+    # a regex scan over multi-KB strings, and it can't falsely match
+    # "tool_name" text embedded inside string payloads
+    try:
+        return _extract_tool_names_from_obj(_json_loads(golden_trajectory_str))
+    except ValueError:
+        pass
+
+    # Fallback for concatenated/partial JSON the one-shot parse rejects
+    return _TOOL_NAME_RE.findall(golden_trajectory_str)
+
+
+def _extract_chunk(chunk: list) -> list:
+    """Extract (task_id, tool_names) pairs for one slice of tasks.
+
+    Top-level so it pickles for the process pool; also the serial path.
+    """
+    extracted = []
+    for task in chunk:
+        task_id = task.get('task_id', '')
+        golden_trajectory = task.get('golden_trajectory', '')
+
+        # Already-parsed trajectories are walked directly; round-tripping
+        # them through json.dumps only to re-parse was wasted work
+        if isinstance(golden_trajectory, (list, dict)):
+            tool_names = _extract_tool_names_from_obj(golden_trajectory)
+        else:
+            golden_trajectory_str = str(golden_trajectory) if golden_trajectory else ''
+            tool_names = extract_tool_names_from_trajectory(golden_trajectory_str)
+
+        extracted.append((task_id, tool_names))
+    return extracted
 
 
 def get_diversity_report(tasks):
@@ -62,83 +164,83 @@ def get_diversity_report(tasks):
     Returns:
         Tuple of (total_tool_analysis, task_specific_tool_analysis, individual_tool_counts, task_data)
     """
-    # Initialize tracking dictionaries
-    sequential_counts = defaultdict(lambda: {'count': 0, 'task_ids': []})
-    individual_tool_counts = defaultdict(int)  # Count individual tool calls
-    task_data_rows = []  # Store task-level data
+    # Parsing is CPU-bound and per-task independent, so large inputs are
+    # split across a process pool; the columnar aggregation below stays
+    # in the parent on the order-preserving merged output
+    if len(tasks) >= _PARALLEL_THRESHOLD:
+        n_workers = os.cpu_count() or 1
+        chunk_size = -(-len(tasks) // n_workers)
+        chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            extracted = [pair for part in pool.map(_extract_chunk, chunks) for pair in part]
+    else:
+        extracted = _extract_chunk(tasks)
 
-    for task in tasks:
-        task_id = task.get('task_id', '')
-        golden_trajectory = task.get('golden_trajectory', '')
-        
-        # Ensure golden_trajectory is a JSON string
-        if isinstance(golden_trajectory, (list, dict)):
-            golden_trajectory_str = json.dumps(golden_trajectory)
-        else:
-            golden_trajectory_str = str(golden_trajectory) if golden_trajectory else ''
-        
-        # Extract all tool names using regex
-        tool_names = extract_tool_names_from_trajectory(golden_trajectory_str)
-        
-        if tool_names:
-            # Count individual tool calls
-            for tool_name in tool_names:
-                individual_tool_counts[tool_name] += 1
-            
-            # Since all tasks are sequential, create pattern as ' > '.join(tool_names)
-            pattern = ' > '.join(tool_names)
-            print('Debugging: ', task_id, pattern)
-            sequential_counts[pattern]['count'] += 1
-            sequential_counts[pattern]['task_ids'].append(task_id)
-            
-            # Add to task data
-            task_data_rows.append({
-                'Task ID': task_id,
-                'Sequential Call': pattern,
-                'Number of Call': len(tool_names)
-            })
-        else:
-            # Task with no tool calls
-            task_data_rows.append({
-                'Task ID': task_id,
-                'Sequential Call': '',
-                'Number of Call': 0
-            })
+    task_ids = []
+    tool_lists = []
+    patterns = []
+    n_calls = []
+
+    for task_id, tool_names in extracted:
+        # Since all tasks are sequential, create pattern as ' > '.join(tool_names)
+        pattern = ' > '.join(tool_names)
+        if _DEBUG and tool_names:
+            logger.debug("task %s pattern %s", task_id, pattern)
+
+        task_ids.append(task_id)
+        tool_lists.append(tool_names)
+        patterns.append(pattern)
+        n_calls.append(len(tool_names))
+
+    ids_s = pd.Series(task_ids, dtype=object)
+    tools_s = pd.Series(tool_lists, dtype=object)
+    patterns_s = pd.Series(patterns, dtype=object)
+
+    # Tasks with no tool calls stay in the task-level sheet but are
+    # excluded from the pattern aggregates
+    mask = patterns_s != ''
+    pattern_frame = pd.DataFrame({'pattern': patterns_s[mask], 'task_id': ids_s[mask]})
+    grouped = pattern_frame.groupby('pattern', sort=False)
+
+    # Sorting the counts Series once lets both pattern frames be built
+    # already ordered, instead of sort_values over each full frame
+    pattern_counts = grouped.size().sort_values(ascending=False)
 
     # Build DF1: Combined view with Call Type (all sequential)
-    df1_rows = []
-    for pattern, data in sequential_counts.items():
-        df1_rows.append({
-            'Tool Call': pattern,
-            'Call Type': 'sequential',
-            'Count': data['count']
-        })
-
-    total_tool_analysis = pd.DataFrame(df1_rows).sort_values('Count', ascending=False).reset_index(drop=True)
-
-    # Build DF2: Sequential patterns with task IDs
-    df2_rows = []
-    for pattern, data in sequential_counts.items():
-        df2_rows.append({
-            'Sequential Call': pattern,
-            'Count': data['count'],
-            'Task IDs': ', '.join(set(data['task_ids']))  # Use set to dedupe if same task has multiple occurrences
-        })
-
-    task_specific_tool_analysis = pd.DataFrame(df2_rows).sort_values('Count', ascending=False).reset_index(drop=True)
-
-    # Build DF3: Individual tool call counts
-    df3_rows = []
-    for tool_name, count in sorted(individual_tool_counts.items(), key=lambda x: x[1], reverse=True):
-        df3_rows.append({
-            'Tool Name': tool_name,
-            'Count': count
-        })
-
-    individual_tool_analysis = pd.DataFrame(df3_rows).reset_index(drop=True)
+    total_tool_analysis = pd.DataFrame({
+        'Tool Call': pattern_counts.index,
+        'Call Type': 'sequential',
+        'Count': pattern_counts.to_numpy()
+    })
+
+    # Build DF2: Sequential patterns with task IDs, reusing the hash
+    # table the groupby above already built rather than grouping a
+    # second deduplicated frame; pd.unique dedupes in C per group and
+    # preserves first-seen order
+    pattern_task_ids = (
+        grouped['task_id']
+        .agg(lambda group: ', '.join(pd.unique(group.to_numpy())))
+        .reindex(pattern_counts.index)
+    )
+    task_specific_tool_analysis = pd.DataFrame({
+        'Sequential Call': pattern_counts.index,
+        'Count': pattern_counts.to_numpy(),
+        'Task IDs': pattern_task_ids.to_numpy()
+    })
+
+    # Build DF3: Individual tool call counts (value_counts sorts descending)
+    tool_counts = tools_s.explode().value_counts()
+    individual_tool_analysis = pd.DataFrame({
+        'Tool Name': tool_counts.index,
+        'Count': tool_counts.to_numpy()
+    })
 
     # Build DF4: Task-level data
-    task_data_df = pd.DataFrame(task_data_rows).reset_index(drop=True)
+    task_data_df = pd.DataFrame({
+        'Task ID': task_ids,
+        'Sequential Call': patterns,
+        'Number of Call': n_calls
+    })
 
     return total_tool_analysis, task_specific_tool_analysis, individual_tool_analysis, task_data_df
 
@@ -156,61 +258,75 @@ def generate_excel_report(csv_file=None, tasks_folder=None, output_excel_file=No
     
     # Load tasks from CSV if provided, otherwise fall back to tasks_folder
     if csv_file:
-        # Load tasks from CSV file
-        df = pd.read_csv(csv_file, encoding='utf-8')
-        
-        # Check required columns
+        # Load tasks from CSV file. Only the two consumed columns are
+        # parsed, and rows stream in chunks so memory stays O(chunk)
+        # instead of the whole sheet
         required_columns = [
             'NEW TASK ID',
             'New Golden Trajectory \n(Human)'
         ]
-        
-        for col in required_columns:
-            if col not in df.columns:
-                raise ValueError(f"Missing required column: '{col}'")
-        
-        # Process each row
-        for idx, row in df.iterrows():
-            task_id = str(row['NEW TASK ID']).strip()
-            golden_trajectory_raw = row['New Golden Trajectory \n(Human)']
-            
-            # Handle trajectory file loading
-            if pd.notna(golden_trajectory_raw):
-                golden_trajectory_value = str(golden_trajectory_raw)
-                
-                # Check if it's a file path and load it
-                if is_trajectory_file_path(golden_trajectory_value):
-                    try:
-                        golden_trajectory_str = load_trajectory_file(golden_trajectory_value)
-                    except FileNotFoundError as e:
-                        print(f"Warning: {e}")
-                        golden_trajectory_str = golden_trajectory_value
-                    except Exception as e:
-                        print(f"Error loading trajectory file {golden_trajectory_value}: {e}")
+        wanted = set(required_columns)
+
+        reader = pd.read_csv(
+            csv_file, encoding='utf-8',
+            usecols=lambda c: c in wanted,
+            dtype={'NEW TASK ID': 'string'},
+            chunksize=50_000
+        )
+
+        for df in reader:
+            # Check required columns (callable usecols silently drops
+            # missing names instead of raising)
+            for col in required_columns:
+                if col not in df.columns:
+                    raise ValueError(f"Missing required column: '{col}'")
+
+            # Zip plain columns; df.iterrows() would box every row into
+            # a Series, which dominates runtime on large chunks
+            ids = df['NEW TASK ID'].astype(str).str.strip().to_numpy()
+            raws = df['New Golden Trajectory \n(Human)'].to_numpy(dtype=object)
+
+            for task_id, golden_trajectory_raw in zip(ids, raws):
+                # Handle trajectory file loading
+                if pd.notna(golden_trajectory_raw):
+                    golden_trajectory_value = str(golden_trajectory_raw)
+
+                    # Check if it's a file path and load it
+                    if is_trajectory_file_path(golden_trajectory_value):
+                        try:
+                            golden_trajectory_str = load_trajectory_file(golden_trajectory_value)
+                        except FileNotFoundError as e:
+                            print(f"Warning: {e}")
+                            golden_trajectory_str = golden_trajectory_value
+                        except Exception as e:
+                            print(f"Error loading trajectory file {golden_trajectory_value}: {e}")
+                            golden_trajectory_str = golden_trajectory_value
+                    else:
+                        # Use value as-is (may be JSON string)
                         golden_trajectory_str = golden_trajectory_value
                 else:
-                    # Use value as-is (may be JSON string)
-                    golden_trajectory_str = golden_trajectory_value
-            else:
-                golden_trajectory_str = ''
-            
-            task = {
-                'task_id': task_id,
-                'golden_trajectory': golden_trajectory_str
-            }
-            tasks.append(task)
-    elif tasks_folder:
-        # Fallback: load from individual JSON files
-        tasks_files = [i for i in os.listdir(tasks_folder) if '.json' in i]
-        for task_file in tasks_files:
-            with open(os.path.join(tasks_folder, task_file), 'r') as f:
-                task_data = json.load(f)
-                # Convert to format expected by get_diversity_report
+                    golden_trajectory_str = ''
+
                 task = {
-                    'task_id': task_data.get('task_id', ''),
-                    'golden_trajectory': json.dumps(task_data.get('golden_trajectory', []))
+                    'task_id': task_id,
+                    'golden_trajectory': golden_trajectory_str
                 }
                 tasks.append(task)
+    elif tasks_folder:
+        # Fallback: load from individual JSON files. scandir carries the
+        # file type without extra stats, and endswith won't match names
+        # like foo.json.bak the way a substring check did
+        with os.scandir(tasks_folder) as entries:
+            tasks_files = [e.path for e in entries if e.is_file() and e.name.endswith('.json')]
+        for task_path in tasks_files:
+            with open(task_path, 'rb') as f:
+                task_data = _json_loads(f.read())
+            # get_diversity_report walks parsed trajectories directly, so
+            # there is no need to re-serialize them to a string here
+            tasks.append({
+                'task_id': task_data.get('task_id', ''),
+                'golden_trajectory': task_data.get('golden_trajectory', [])
+            })
     else:
         raise ValueError("Either csv_file or tasks_folder must be provided")
     
@@ -242,7 +358,8 @@ def generate_excel_report(csv_file=None, tasks_folder=None, output_excel_file=No
     }
     summary_df = pd.DataFrame(summary_data)
 
-    with pd.ExcelWriter(output_excel_file, engine='openpyxl') as writer:
+    # The large Task Data sheet goes last so row-flush applies to it
+    with pd.ExcelWriter(output_excel_file, **_EXCEL_WRITER_KWARGS) as writer:
         summary_df.to_excel(writer, sheet_name='Summary', index=False)
         all_diversity_report.to_excel(writer, sheet_name='Diversity Report', index=False)
         task_specific_diversity_report.to_excel(writer, sheet_name='Task Specific Diversity Report', index=False)
@@ -2,27 +2,144 @@
 RLToolUseEval Quality Evaluator
 Dual-provider (OpenAI + Gemini) evaluation engine for RL Tool Use Data Generation
 """
+import asyncio
+import functools
+import hashlib
 import json
 import logging
 import os
+import random
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Any, Union
 from datetime import datetime
 
 from config import (
-    QUALITY_DIMENSIONS, PROVIDER, 
+    QUALITY_DIMENSIONS, PROVIDER,
     OPENAI_API_KEY, OPENAI_MODEL,
     GOOGLE_API_KEY, GOOGLE_MODEL,
-    REQUEST_TIMEOUT, FAILURE_CATEGORIES, FLAGS
+    REQUEST_TIMEOUT, FAILURE_CATEGORIES, FLAGS,
+    LLM_CACHE_DIR
 )
 from langsmith import traceable
 
-# Conditional imports for providers
-if PROVIDER == 'google':
-    from google import genai
-    from google.genai import types
-elif PROVIDER == 'openai':
-    import openai
+# orjson is optional but serializes and parses severalfold faster than
+# stdlib json, which matters in prompt assembly and flag detection
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _dumps_indent(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+except ImportError:
+    def _json_loads(data):
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+    def _dumps_indent(obj) -> str:
+        return json.dumps(obj, indent=2)
+
+# Anchor the cache next to this module (same pattern as prompts/tools)
+# so the frontend and batch runner share it regardless of cwd
+_LLM_CACHE_PATH = os.path.join(os.path.dirname(__file__), LLM_CACHE_DIR)
+
+# Flag/failure detection patterns, compiled once at import. The refusal,
+# completion and question checks are alternations so a single scan of the
+# agent response replaces several sequential re.search calls
+_REFUSAL_RE = re.compile(
+    r"i cannot assist|i'm not able to|i can't help with|outside my capabilities|i don't have access",
+    re.IGNORECASE
+)
+_COMPLETION_RE = re.compile(r"i have completed|done|task is complete|successfully", re.IGNORECASE)
+_QUESTION_RE = re.compile(r"\?|would you like|should i|can you confirm", re.IGNORECASE)
+
+# Known domains, matched in one pass against lowercased filenames
+_DOMAIN_RE = re.compile(r'paypal|slack|stripe|discord')
+
+# Simple alphanumeric ID pattern (case-sensitive by design)
+_ID_RE = re.compile(r'[A-Z0-9]{10,}|[A-Z]+-[A-Z0-9]+')
+
+# Agent-prompt placeholders, substituted in one compiled-regex pass so
+# the template is walked once instead of once per str.replace
+_PLACEHOLDER_RE = re.compile(
+    r'\{(tool_definitions|allowed_tools|prompt_text|expected_tools|system_prompt|'
+    r'happy_path_steps|happy_path|model_runs|verifiers|detected_flags)\}'
+)
+
+_API_PARAM_RES = (
+    re.compile(r'\b(is_private|is_public|user_id|channel_id|webhook_id)\s*=', re.IGNORECASE),
+    re.compile(r'set\s+(\w+_\w+)\s+to', re.IGNORECASE),
+    re.compile(r'parameter\s+(\w+)', re.IGNORECASE),
+)
+
+# Retry/circuit-breaker tuning for provider calls. Transient errors
+# (rate limits, 5xx, connection resets) are retried with capped
+# exponential backoff plus jitter; after _BREAKER_THRESHOLD consecutive
+# final failures the breaker opens so a dead provider fails fast instead
+# of costing a full backoff ladder per task
+_RETRY_MAX_ATTEMPTS = 4
+_RETRY_BASE_DELAY = 1.0
+_RETRY_MAX_DELAY = 30.0
+_BREAKER_THRESHOLD = 8
+_BREAKER_COOLDOWN = 60.0
+
+
+def _iter_strings(obj):
+    """Yield every string leaf in a nested dict/list structure."""
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from _iter_strings(value)
+    elif isinstance(obj, list):
+        for value in obj:
+            yield from _iter_strings(value)
+
+
+def _collect_result_ids(obj, known_ids: set):
+    """Add the values of nested 'id' keys to known_ids.
+
+    Exact key matching on the structure replaces regexing a serialized
+    copy, so it can't be fooled by 'id' text inside string payloads.
+    """
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if key == "id" and isinstance(value, str):
+                known_ids.add(value)
+            else:
+                _collect_result_ids(value, known_ids)
+    elif isinstance(obj, list):
+        for value in obj:
+            _collect_result_ids(value, known_ids)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_tool_info_cached(domain: str) -> Tuple[List[Dict[str, Any]], str]:
+    """Read, parse and pre-serialize tools/{domain}.json once per domain.
+
+    Domain tool files are immutable at runtime, so every later task in
+    the same domain shares the parsed list and the sorted indented JSON
+    string (the form the system prompt embeds) without touching disk.
+    """
+    tool_file = os.path.join(os.path.dirname(__file__), 'tools', f'{domain}.json')
+
+    try:
+        with open(tool_file, 'rb') as f:
+            tools = _json_loads(f.read())
+    except FileNotFoundError:
+        logging.getLogger(__name__).warning(f"Tool info file not found: {tool_file}")
+        return [], "[]"
+    except ValueError as e:
+        # Covers both json and orjson decode errors
+        logging.getLogger(__name__).error(f"Error parsing tool info file: {e}")
+        return [], "[]"
+
+    return tools, json.dumps(tools, indent=2, sort_keys=True)
 
 
 class QualityEvaluator:
@@ -31,18 +148,79 @@ class QualityEvaluator:
     def __init__(self, provider: str = None):
         self.provider = provider or PROVIDER
         self.logger = logging.getLogger(__name__)
+        # Small pool for overlapping the paired file reads in
+        # load_task_data/load_prompts; the reads are independent
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='eval-io')
+        # Circuit-breaker state shared by the sync and async call paths
+        self._breaker_lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._breaker_open_until = 0.0
+        # In-flight async calls by cache key, so concurrent identical
+        # prompts share one provider round-trip (see _get_llm_response_async)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Async clients by event loop (see _get_async_client)
+        self._async_clients: Dict[Any, Any] = {}
         self._init_client()
     
     def _init_client(self):
-        """Initialize the LLM client based on provider."""
+        """Initialize the LLM client based on provider.
+
+        The provider SDK is imported here rather than at module import:
+        both SDKs pull in heavy dependency trees, and only the selected
+        one should cost startup time.
+        """
         if self.provider == 'google':
+            from google import genai
+            from google.genai import types
+            self._types = types
+            # genai.Client keeps one persistent session internally
             self.client = genai.Client()
             self.model = GOOGLE_MODEL
         elif self.provider == 'openai':
-            self.client = openai.OpenAI()
+            import httpx
+            import openai
+            # Sized keep-alive pools so concurrent dimension calls reuse
+            # warm connections instead of paying a TLS handshake each
+            limits = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            # max_retries=0: retries are handled by our own backoff loop
+            # so both providers share one policy and one circuit breaker
+            self.client = openai.OpenAI(
+                max_retries=0,
+                http_client=httpx.Client(limits=limits, timeout=REQUEST_TIMEOUT)
+            )
             self.model = OPENAI_MODEL
         else:
             raise ValueError(f"Unknown provider: {self.provider}")
+
+    def _get_async_client(self):
+        """Return an async client bound to the running event loop.
+
+        evaluate_task starts one asyncio.run per task, and keep-alive
+        connections pooled under a previous (now closed) loop fail with
+        "Event loop is closed" when reused. Creating the async client
+        lazily per loop keeps connection reuse within a loop's lifetime
+        while sequential tasks on one evaluator each get a live client.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            # Drop clients whose loops have since closed
+            for stale in [l for l in self._async_clients if l.is_closed()]:
+                del self._async_clients[stale]
+
+            if self.provider == 'google':
+                from google import genai
+                client = genai.Client().aio
+            else:
+                import httpx
+                import openai
+                limits = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+                client = openai.AsyncOpenAI(
+                    max_retries=0,
+                    http_client=httpx.AsyncClient(limits=limits, timeout=REQUEST_TIMEOUT)
+                )
+            self._async_clients[loop] = client
+        return client
     
     # ==========================================================================
     # Tool Definition Loading (Same pattern as HumanTraceEval)
@@ -60,18 +238,8 @@ class QualityEvaluator:
         if not domain:
             self.logger.warning("No domain specified, cannot load tool info")
             return []
-        
-        tool_file = os.path.join(os.path.dirname(__file__), 'tools', f'{domain}.json')
-        
-        try:
-            with open(tool_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            self.logger.warning(f"Tool info file not found: {tool_file}")
-            return []
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Error parsing tool info file: {e}")
-            return []
+
+        return _load_tool_info_cached(domain)[0]
     
     def _extract_tool_names(self, tool_info: List[Dict[str, Any]]) -> List[str]:
         """Extract tool names from tool_info, handling different formats.
@@ -94,103 +262,295 @@ class QualityEvaluator:
     # LLM API Calls
     # ==========================================================================
     
-    @traceable(run_type="llm", name="LLM Call")
-    def _get_llm_response(self, system_prompt: str, user_prompt: str) -> str:
-        """Get response from LLM based on configured provider."""
-        try:
-            if self.provider == 'google':
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=user_prompt,
-                    config=types.GenerateContentConfig(
-                        system_instruction=system_prompt,
-                        temperature=0.3,
-                    ),
+    def _response_cache_key(self, system_prompt: str, user_prompt: str,
+                            json_response: bool = False) -> str:
+        """Build a cache key for a raw LLM exchange.
+
+        Keyed on (provider, model, system, user) so identical prompts hit
+        the cache regardless of which evaluation path built them.
+        """
+        canonical = json.dumps(
+            {"model": self.model, "system": system_prompt,
+             "user": user_prompt, "json": json_response},
+            sort_keys=True, separators=(',', ':')
+        )
+        digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+        return f"response_{self.provider}_{digest}"
+
+    def _check_breaker(self):
+        """Fail fast while the circuit breaker is open."""
+        if time.monotonic() < self._breaker_open_until:
+            raise RuntimeError(
+                f"LLM circuit breaker open after {_BREAKER_THRESHOLD} "
+                f"consecutive failures; provider calls suspended"
+            )
+
+    def _record_failure(self):
+        with self._breaker_lock:
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= _BREAKER_THRESHOLD:
+                self._breaker_open_until = time.monotonic() + _BREAKER_COOLDOWN
+                self.logger.error(
+                    f"{self._consecutive_failures} consecutive LLM failures; "
+                    f"suspending provider calls for {_BREAKER_COOLDOWN:.0f}s"
                 )
-                return response.candidates[0].content.parts[0].text
-            
-            elif self.provider == 'openai':
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    timeout=REQUEST_TIMEOUT
+
+    def _record_success(self):
+        with self._breaker_lock:
+            self._consecutive_failures = 0
+
+    @staticmethod
+    def _retry_delay(attempt: int) -> float:
+        """Backoff before retry `attempt`: capped exponential plus jitter."""
+        delay = min(_RETRY_BASE_DELAY * (2 ** (attempt - 1)), _RETRY_MAX_DELAY)
+        return delay * (0.5 + random.random())
+
+    def _call_provider(self, system_prompt: str, user_prompt: str,
+                       json_response: bool) -> str:
+        """One provider round-trip, without caching or retry handling."""
+        if self.provider == 'google':
+            response = self.client.models.generate_content(
+                model=self.model,
+                contents=user_prompt,
+                config=self._types.GenerateContentConfig(
+                    system_instruction=system_prompt,
+                    temperature=0.3,
+                    response_mime_type="application/json" if json_response else None,
+                ),
+            )
+            return response.candidates[0].content.parts[0].text
+
+        kwargs = {"response_format": {"type": "json_object"}} if json_response else {}
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            timeout=REQUEST_TIMEOUT,
+            **kwargs
+        )
+        return response.choices[0].message.content.strip()
+
+    async def _call_provider_async(self, system_prompt: str, user_prompt: str) -> str:
+        """Async counterpart of _call_provider."""
+        client = self._get_async_client()
+        if self.provider == 'google':
+            response = await client.models.generate_content(
+                model=self.model,
+                contents=user_prompt,
+                config=self._types.GenerateContentConfig(
+                    system_instruction=system_prompt,
+                    temperature=0.3,
+                ),
+            )
+            return response.candidates[0].content.parts[0].text
+
+        response = await client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            timeout=REQUEST_TIMEOUT
+        )
+        return response.choices[0].message.content.strip()
+
+    @traceable(run_type="llm", name="LLM Call")
+    def _get_llm_response(self, system_prompt: str, user_prompt: str,
+                          json_response: bool = False) -> str:
+        """Get response from LLM based on configured provider.
+
+        json_response enforces a JSON-object reply at the provider level
+        (structured output), used by the batched dimension path. Provider
+        calls retry with exponential backoff behind a circuit breaker.
+        """
+        # Exact-match cache: reruns and dev iteration repeat identical
+        # prompts, and cache hits cost neither latency nor tokens
+        cache_key = self._response_cache_key(system_prompt, user_prompt, json_response)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached["response"]
+
+        self._check_breaker()
+        for attempt in range(1, _RETRY_MAX_ATTEMPTS + 1):
+            try:
+                text = self._call_provider(system_prompt, user_prompt, json_response)
+            except Exception as e:
+                self._record_failure()
+                if attempt == _RETRY_MAX_ATTEMPTS:
+                    self.logger.error(f"LLM API error: {e}")
+                    raise
+                delay = self._retry_delay(attempt)
+                self.logger.warning(
+                    f"LLM call failed (attempt {attempt}/{_RETRY_MAX_ATTEMPTS}): "
+                    f"{e}; retrying in {delay:.1f}s"
                 )
-                return response.choices[0].message.content.strip()
-        
-        except Exception as e:
-            self.logger.error(f"LLM API error: {e}")
+                time.sleep(delay)
+            else:
+                self._record_success()
+                self._cache_put(cache_key, {"response": text})
+                return text
+
+    @traceable(run_type="llm", name="LLM Call (async)")
+    async def _get_llm_response_async(self, system_prompt: str, user_prompt: str) -> str:
+        """Async variant of _get_llm_response using the provider's async client.
+
+        Coroutines cost bytes instead of thread stacks, so callers can keep
+        far more dimension evaluations in flight than THREADS_PER_TASK.
+        """
+        # Shares the exact-match response cache with the sync path
+        cache_key = self._response_cache_key(system_prompt, user_prompt)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached["response"]
+
+        # Coalesce concurrent duplicates: the disk cache only covers
+        # completed calls, so identical prompts issued while the first
+        # is still in flight would each pay a provider round-trip.
+        # Followers await the leader's future instead.
+        existing = self._inflight.get(cache_key)
+        if existing is not None:
+            return await existing
+
+        self._check_breaker()
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            for attempt in range(1, _RETRY_MAX_ATTEMPTS + 1):
+                try:
+                    text = await self._call_provider_async(system_prompt, user_prompt)
+                except Exception as e:
+                    self._record_failure()
+                    if attempt == _RETRY_MAX_ATTEMPTS:
+                        self.logger.error(f"LLM API error: {e}")
+                        raise
+                    delay = self._retry_delay(attempt)
+                    self.logger.warning(
+                        f"LLM call failed (attempt {attempt}/{_RETRY_MAX_ATTEMPTS}): "
+                        f"{e}; retrying in {delay:.1f}s"
+                    )
+                    await asyncio.sleep(delay)
+                else:
+                    self._record_success()
+                    self._cache_put(cache_key, {"response": text})
+                    future.set_result(text)
+                    return text
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so lone failures don't log a spurious
+            # "exception was never retrieved" warning at GC time
+            future.exception()
             raise
-    
+        finally:
+            del self._inflight[cache_key]
+
     # ==========================================================================
     # Prompt Loading
     # ==========================================================================
+
+    @staticmethod
+    def _read_json_file(path: str):
+        with open(path, 'rb') as f:
+            return _json_loads(f.read())
+
+    @staticmethod
+    def _read_text_file(path: str) -> str:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
     
-    def load_prompts(self, dimension_key: str) -> Tuple[str, str]:
-        """Load system and agent prompts for a specific quality dimension."""
+    def load_prompts(self, dimension_key: str, task_data: Dict[str, Any] = None) -> Tuple[str, str]:
+        """Load system and agent prompts for a specific quality dimension.
+
+        When task_data is given, the task's tool definitions are appended
+        to the system prompt. That block is identical for every dimension
+        of a task (and every task of a domain), so keeping it in the
+        stable system prefix lets providers serve it from their prompt
+        cache instead of re-processing it per call.
+        """
         try:
             base_dir = os.path.dirname(__file__)
-            
+
             system_path = os.path.join(base_dir, QUALITY_DIMENSIONS[dimension_key]["system_prompt_file"])
             agent_path = os.path.join(base_dir, QUALITY_DIMENSIONS[dimension_key]["agent_prompt_file"])
-            
-            with open(system_path, 'r', encoding='utf-8') as f:
-                system_prompt = f.read().strip()
-            
-            with open(agent_path, 'r', encoding='utf-8') as f:
-                agent_prompt = f.read().strip()
-            
+
+            system_future = self._io_pool.submit(self._read_text_file, system_path)
+            agent_future = self._io_pool.submit(self._read_text_file, agent_path)
+            system_prompt = system_future.result().strip()
+            agent_prompt = agent_future.result().strip()
+
+            if task_data is not None:
+                system_prompt += self._tool_context_block(task_data)
+
             return system_prompt, agent_prompt
-        
+
         except FileNotFoundError as e:
             self.logger.error(f"Prompt file not found for {dimension_key}: {e}")
             return "", ""
+
+    @staticmethod
+    def _tool_context_block(task_data: Dict[str, Any]) -> str:
+        """Build the tool-definitions block appended to system prompts."""
+        # sort_keys keeps the block byte-identical across calls, which is
+        # what provider prefix caches key on; the domain cache usually
+        # has the string pre-serialized already
+        tool_definitions_json = task_data.get("tool_definitions_json")
+        if tool_definitions_json is None:
+            tool_definitions_json = json.dumps(
+                task_data.get("tool_definitions", []), indent=2, sort_keys=True)
+        return (
+            "\n\n<tool_definitions>\n"
+            + tool_definitions_json
+            + "\n</tool_definitions>\n<allowed_tools>\n"
+            + json.dumps(task_data.get("allowed_tools", []), indent=2)
+            + "\n</allowed_tools>"
+        )
     
     # ==========================================================================
     # Data Transformation
     # ==========================================================================
     
-    def load_task_data(self, config_path: str, results_path: str) -> Dict[str, Any]:
+    def load_task_data(self, config_path: str, results_path: str,
+                       domain_override: Optional[str] = None) -> Dict[str, Any]:
         """Load and merge config and results files into a unified task object.
-        
-        Also loads tool definitions from domain-specific file.
+
+        Also loads tool definitions from domain-specific file. A caller-
+        supplied domain_override (e.g. from the UI) wins over anything
+        detected in the config.
         """
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-        
-        with open(results_path, 'r', encoding='utf-8') as f:
-            results_data = json.load(f)
-        
-        # Extract domain from config (e.g., 'paypal', 'slack', 'stripe')
-        # Look in scenario_config.mcp_server_name or metadata.domain
+        # Read both files concurrently; result JSONs can be large
+        config_future = self._io_pool.submit(self._read_json_file, config_path)
+        results_future = self._io_pool.submit(self._read_json_file, results_path)
+        config_data = config_future.result()
+        results_data = results_future.result()
+
         # Extract domain from config (e.g., 'paypal', 'slack', 'stripe')
         # Robust check: scenario_config, top-level, or metadata
         domain = None
         scenario_config = config_data.get("scenario_config", {})
-        
-        if "mcp_server_name" in scenario_config:
+
+        if domain_override:
+            domain = domain_override
+        elif "mcp_server_name" in scenario_config:
             domain = scenario_config["mcp_server_name"]
         elif "mcp_server_name" in config_data:
             domain = config_data["mcp_server_name"]
         elif "domain" in config_data.get("metadata", {}):
             domain = config_data["metadata"]["domain"]
-            
-        # UI Override (highest priority if provided)
-        if task_data.get("domain_override"):
-            domain = task_data["domain_override"]
-        
-        # Fallback: Try to guess from config filename
+
+        # Fallback: Try to guess from config filename in one scan
         if not domain and config_path != "uploaded":
-            filename = os.path.basename(config_path).lower()
-            if "paypal" in filename: domain = "paypal"
-            elif "slack" in filename: domain = "slack"
-            elif "stripe" in filename: domain = "stripe"
-            elif "discord" in filename: domain = "discord"
+            match = _DOMAIN_RE.search(os.path.basename(config_path).lower())
+            if match:
+                domain = match.group(0)
         
-        # Load tool definitions for this domain
-        tool_definitions = self._load_tool_info(domain)
+        # Load tool definitions for this domain (cached per domain,
+        # together with their pre-serialized JSON form)
+        if domain:
+            tool_definitions, tool_definitions_json = _load_tool_info_cached(domain)
+        else:
+            self.logger.warning("No domain specified, cannot load tool info")
+            tool_definitions, tool_definitions_json = [], "[]"
         allowed_tools = self._extract_tool_names(tool_definitions)
         
         return {
@@ -200,8 +560,10 @@ class QualityEvaluator:
             "results": results_data,
             "config_path": config_path,
             "results_path": results_path,
-            # Tool definitions loaded from tools/{domain}.json
+            # Tool definitions loaded from tools/{domain}.json, plus the
+            # pre-serialized form the system prompt embeds
             "tool_definitions": tool_definitions,
+            "tool_definitions_json": tool_definitions_json,
             "allowed_tools": allowed_tools
         }
     
@@ -285,8 +647,13 @@ class QualityEvaluator:
     # Auto-Detection of Failure Categories
     # ==========================================================================
     
-    def detect_failure_category(self, model_run: Dict[str, Any], expected_tools: List[str]) -> str:
-        """Auto-detect the failure category based on model run data."""
+    def detect_failure_category(self, model_run: Dict[str, Any], expected_tools: List[str],
+                                expected_set: Optional[frozenset] = None) -> str:
+        """Auto-detect the failure category based on model run data.
+
+        Callers checking many runs against the same expectations can pass
+        expected_set to build the frozenset once instead of per run.
+        """
         mcp_calls = model_run.get("mcp_tool_calls", [])
         agent_response = model_run.get("agent_response", "")
         overall_success = model_run.get("overall_success", False)
@@ -296,42 +663,31 @@ class QualityEvaluator:
             return "pass"
         
         # Check for Refusal
-        refusal_patterns = [
-            r"i cannot assist",
-            r"i'm not able to",
-            r"i can't help with",
-            r"outside my capabilities",
-            r"i don't have access"
-        ]
-        for pattern in refusal_patterns:
-            if re.search(pattern, agent_response.lower()):
-                return "refusal"
-        
+        if _REFUSAL_RE.search(agent_response):
+            return "refusal"
+
         # Check if model made any tool calls
         if not mcp_calls:
             # Model didn't call any tools but gave a response
             if agent_response:
                 # Check if it claimed to complete the task (hallucination)
-                completion_patterns = [r"i have completed", r"done", r"task is complete", r"successfully"]
-                for pattern in completion_patterns:
-                    if re.search(pattern, agent_response.lower()):
-                        return "hallucination"
-                
+                if _COMPLETION_RE.search(agent_response):
+                    return "hallucination"
+
                 # Check if asking for confirmation
-                question_patterns = [r"\?", r"would you like", r"should i", r"can you confirm"]
-                for pattern in question_patterns:
-                    if re.search(pattern, agent_response.lower()):
-                        return "asking_confirmation"
-            
+                if _QUESTION_RE.search(agent_response):
+                    return "asking_confirmation"
+
             return "incomplete"
         
         # Model made tool calls - check if correct tools
-        called_tools = [call.get("tool_name") for call in mcp_calls]
-        
-        # Check for wrong tool
-        for called in called_tools:
-            if called and called not in expected_tools:
-                return "wrong_tool"
+        if expected_set is None:
+            expected_set = frozenset(expected_tools)
+
+        # Check for wrong tool: set lookup instead of a list scan per call
+        if any(called and called not in expected_set
+               for called in (call.get("tool_name") for call in mcp_calls)):
+            return "wrong_tool"
         
         # If tools are correct but verification failed, likely wrong parameter
         return "wrong_parameter"
@@ -384,46 +740,37 @@ class QualityEvaluator:
         magic_ids = []
         known_ids = set()
         
-        # Whitelist IDs from prompt
+        # Whitelist IDs from prompt, streaming matches straight into the
+        # set instead of materializing a findall list first
         if prompt:
-            # Simple alphanumeric ID pattern
-            prompt_ids = re.findall(r'[A-Z0-9]{10,}|[A-Z]+-[A-Z0-9]+', prompt)
-            known_ids.update(prompt_ids)
-        
+            known_ids.update(m.group(0) for m in _ID_RE.finditer(prompt))
+
         for tool in tools:
-            # Get IDs from arguments
+            # Scan string leaves of the arguments directly; serializing
+            # the whole structure just to regex it allocated copies
+            # proportional to the tool payload size
             args = tool.get("arguments", {})
-            args_str = json.dumps(args)
-            
-            # Find ID patterns
-            id_patterns = re.findall(r'[A-Z0-9]{10,}|[A-Z]+-[A-Z0-9]+', args_str)
-            
-            for id_val in id_patterns:
-                if id_val not in known_ids:
-                    magic_ids.append(f"ID '{id_val}' used in {tool.get('name')} before retrieval")
-            
+            for leaf in _iter_strings(args):
+                for match in _ID_RE.finditer(leaf):
+                    id_val = match.group(0)
+                    if id_val not in known_ids:
+                        magic_ids.append(f"ID '{id_val}' used in {tool.get('name')} before retrieval")
+
             # Add IDs from output to known set
             execution_results = tool.get("tool_execution_results") or {}
             result = execution_results.get("result", {})
-            result_str = json.dumps(result)
-            found_ids = re.findall(r'"id":\s*"([^"]+)"', result_str)
-            known_ids.update(found_ids)
+            _collect_result_ids(result, known_ids)
         
         return magic_ids
     
     def _detect_api_params_in_prompt(self, prompt: str) -> List[str]:
         """Detect API parameter names in the prompt."""
-        api_param_patterns = [
-            r'\b(is_private|is_public|user_id|channel_id|webhook_id)\s*=',
-            r'set\s+(\w+_\w+)\s+to',
-            r'parameter\s+(\w+)',
-        ]
-        
         found = []
-        for pattern in api_param_patterns:
-            matches = re.findall(pattern, prompt.lower())
+        for pattern in _API_PARAM_RES:
+            # Patterns are IGNORECASE, so no lowered copy of the prompt
+            matches = [m.lower() for m in pattern.findall(prompt)]
             found.extend(matches)
-        
+
         return found
     
     def _detect_redundant_calls(self, tools: List[Dict]) -> List[str]:
@@ -441,69 +788,258 @@ class QualityEvaluator:
     # ==========================================================================
     
     def process_agent_prompt(self, dimension_key: str, agent_prompt: str, task_data: Dict[str, Any]) -> str:
-        """Replace placeholders in agent prompt with actual data."""
-        processed = agent_prompt
-        
-        # Common: Add tool definitions and allowed tools to ALL prompts
-        tool_definitions = task_data.get("tool_definitions", [])
-        allowed_tools = task_data.get("allowed_tools", [])
-        processed = processed.replace("{tool_definitions}", json.dumps(tool_definitions, indent=2))
-        processed = processed.replace("{allowed_tools}", json.dumps(allowed_tools, indent=2))
-        
+        """Replace placeholders in agent prompt with actual data.
+
+        Builds one substitution map and applies it in a single compiled-
+        regex pass; the previous replace chain re-scanned and re-allocated
+        the whole multi-KB prompt once per placeholder.
+        """
+        # Tool definitions live in the system prompt now (stable prefix
+        # the provider can cache); the user prompt only points there
+        subs = {
+            "tool_definitions": "(see <tool_definitions> in the system instructions)",
+            "allowed_tools": "(see <allowed_tools> in the system instructions)",
+        }
+
         if dimension_key == "prompt_quality":
             data = self.extract_prompt_data(task_data)
-            processed = processed.replace("{prompt_text}", data.get("prompt_text", ""))
-            processed = processed.replace("{expected_tools}", json.dumps(data.get("expected_tools", []), indent=2))
-            processed = processed.replace("{system_prompt}", data.get("system_prompt", ""))
-        
+            subs["prompt_text"] = data.get("prompt_text", "")
+            subs["expected_tools"] = _dumps_indent(data.get("expected_tools", []))
+            subs["system_prompt"] = data.get("system_prompt", "")
+
         elif dimension_key == "happy_path_execution":
             data = self.extract_happy_path_data(task_data)
-            processed = processed.replace("{expected_tools}", json.dumps(data.get("expected_tools", []), indent=2))
-            processed = processed.replace("{happy_path_steps}", json.dumps(data.get("happy_path_steps", []), indent=2))
-        
+            subs["expected_tools"] = _dumps_indent(data.get("expected_tools", []))
+            subs["happy_path_steps"] = _dumps_indent(data.get("happy_path_steps", []))
+
         elif dimension_key == "sql_verifier_quality":
             data = self.extract_sql_verifier_data(task_data)
-            processed = processed.replace("{verifiers}", json.dumps(data.get("verifiers", []), indent=2))
-            processed = processed.replace("{prompt_text}", data.get("prompt_text", ""))
-        
+            subs["verifiers"] = _dumps_indent(data.get("verifiers", []))
+            subs["prompt_text"] = data.get("prompt_text", "")
+
         elif dimension_key == "model_benchmarking":
             data = self.extract_model_run_data(task_data)
-            processed = processed.replace("{expected_tools}", json.dumps(data.get("expected_tools", []), indent=2))
-            processed = processed.replace("{happy_path}", json.dumps(data.get("happy_path", []), indent=2))
-            processed = processed.replace("{model_runs}", json.dumps(data.get("model_runs", []), indent=2))
-        
-        # Add detected flags
-        flags = self.detect_flags(task_data)
-        processed = processed.replace("{detected_flags}", json.dumps(flags, indent=2))
-        
-        return processed
+            subs["expected_tools"] = _dumps_indent(data.get("expected_tools", []))
+            subs["happy_path"] = _dumps_indent(data.get("happy_path", []))
+            subs["model_runs"] = _dumps_indent(data.get("model_runs", []))
+
+        # Add detected flags, reusing the per-task serialization when the
+        # caller computed it (detect_flags rescans the whole tools list)
+        flags_json = task_data.get("_detected_flags_json")
+        if flags_json is None:
+            flags_json = _dumps_indent(self.detect_flags(task_data))
+        subs["detected_flags"] = flags_json
+
+        # Placeholders not populated for this dimension pass through
+        # unchanged, matching the old replace-chain behavior
+        return _PLACEHOLDER_RE.sub(
+            lambda m: subs.get(m.group(1), m.group(0)), agent_prompt
+        )
     
+    # ==========================================================================
+    # LLM Response Caching
+    # ==========================================================================
+
+    def _cache_key(self, dimension_key: str, task_data: Dict[str, Any]) -> str:
+        """Build a stable cache key for a dimension evaluation.
+
+        Canonical JSON (sorted keys, no whitespace) makes semantically-equal
+        payloads hash to the same key regardless of dict ordering.
+        """
+        canonical = json.dumps(task_data, sort_keys=True, separators=(',', ':'), default=str)
+        digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+        return f"{dimension_key}_{self.provider}_{self.model}_{digest}"
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached evaluation result, returning None on miss."""
+        cache_path = os.path.join(_LLM_CACHE_PATH, f"{key}.json")
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _cache_put(self, key: str, result: Dict[str, Any]):
+        """Persist an evaluation result to the disk cache."""
+        try:
+            os.makedirs(_LLM_CACHE_PATH, exist_ok=True)
+            cache_path = os.path.join(_LLM_CACHE_PATH, f"{key}.json")
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+        except Exception as e:
+            # Cache failures must never fail the evaluation itself
+            self.logger.warning(f"Could not write LLM cache entry: {e}")
+
     # ==========================================================================
     # Evaluation
     # ==========================================================================
-    
+
     @traceable(run_type="chain", name="Evaluate Dimension")
     def evaluate_quality_dimension(self, dimension_key: str, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Evaluate a single quality dimension."""
         try:
-            system_prompt, agent_prompt = self.load_prompts(dimension_key)
-            
+            cache_key = self._cache_key(dimension_key, task_data)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                self.logger.info(f"Cache hit for {dimension_key}")
+                return cached
+
+            system_prompt, agent_prompt = self.load_prompts(dimension_key, task_data)
+
             if not system_prompt or not agent_prompt:
                 return {
                     "dimension": dimension_key,
                     "response": "Prompts not configured",
                     "error": "Empty prompt files"
                 }
-            
+
             processed_prompt = self.process_agent_prompt(dimension_key, agent_prompt, task_data)
             response = self._get_llm_response(system_prompt, processed_prompt)
-            
+
+            result = {
+                "dimension": dimension_key,
+                "response": response,
+                "error": None
+            }
+            self._cache_put(cache_key, result)
+            return result
+
+        except Exception as e:
+            self.logger.error(f"Error evaluating {dimension_key}: {e}")
             return {
+                "dimension": dimension_key,
+                "response": f"Evaluation error: {str(e)}",
+                "error": str(e)
+            }
+
+    def _parse_batch_response(self, response: str, dimension_keys: List[str]) -> Optional[Dict[str, str]]:
+        """Parse the combined JSON response from a batched dimension call.
+
+        Returns None if the response is not a JSON object covering every
+        requested dimension, signalling the caller to fall back.
+        """
+        text = response.strip()
+        if text.startswith('```'):
+            text = re.sub(r'^```(?:json)?\s*|\s*```$', '', text)
+
+        try:
+            parsed = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+
+        if not isinstance(parsed, dict):
+            return None
+        if not all(key in parsed for key in dimension_keys):
+            return None
+
+        return {key: str(parsed[key]) for key in dimension_keys}
+
+    @traceable(run_type="chain", name="Evaluate Dimensions Batch")
+    def evaluate_dimensions_batch(self, dimension_keys: List[str],
+                                  task_data: Dict[str, Any]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Evaluate several quality dimensions in a single LLM round-trip.
+
+        Concatenates each dimension's prompts into one request and asks the
+        model for a JSON object keyed by dimension. Returns a mapping of
+        dimension key to the usual result dict, or None when the combined
+        response cannot be parsed — callers should then fall back to
+        per-dimension evaluation.
+        """
+        try:
+            # Serve dimensions already in the disk cache, batch the rest
+            results = {}
+            pending = []
+            for dim_key in dimension_keys:
+                cached = self._cache_get(self._cache_key(dim_key, task_data))
+                if cached is not None:
+                    results[dim_key] = cached
+                else:
+                    pending.append(dim_key)
+
+            if not pending:
+                return results
+
+            system_sections = []
+            prompt_sections = []
+            for dim_key in pending:
+                # Bare section prompts: the tool-definitions block is
+                # identical per dimension, so it is appended once below
+                # instead of once per section
+                system_prompt, agent_prompt = self.load_prompts(dim_key)
+                if not system_prompt or not agent_prompt:
+                    return None
+                processed = self.process_agent_prompt(dim_key, agent_prompt, task_data)
+                system_sections.append(f"### {dim_key}\n{system_prompt}")
+                prompt_sections.append(f"### {dim_key}\n{processed}")
+
+            combined_system = (
+                "You are evaluating several quality dimensions in one pass. "
+                "Apply each dimension's instructions below to the matching "
+                "section of the user message. Respond with a single JSON "
+                "object mapping each dimension key to its full evaluation "
+                "text, with no other output.\n\n"
+                + "\n\n".join(system_sections)
+                + self._tool_context_block(task_data)
+            )
+            combined_prompt = "\n\n".join(prompt_sections)
+
+            # Structured output makes the model's JSON contract explicit
+            # instead of relying on the instructions alone
+            response = self._get_llm_response(combined_system, combined_prompt, json_response=True)
+            parsed = self._parse_batch_response(response, pending)
+            if parsed is None:
+                self.logger.warning("Batched dimension response was not parseable; falling back")
+                return None
+
+            for dim_key in pending:
+                result = {
+                    "dimension": dim_key,
+                    "response": parsed[dim_key],
+                    "error": None
+                }
+                self._cache_put(self._cache_key(dim_key, task_data), result)
+                results[dim_key] = result
+
+            return results
+
+        except Exception as e:
+            self.logger.error(f"Batched dimension evaluation failed: {e}")
+            return None
+
+    async def evaluate_quality_dimension_async(self, dimension_key: str,
+                                               task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of evaluate_quality_dimension.
+
+        Prompt preparation is CPU-light and runs inline; only the LLM call
+        itself awaits. Shares the same disk cache as the sync path.
+        """
+        try:
+            cache_key = self._cache_key(dimension_key, task_data)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                self.logger.info(f"Cache hit for {dimension_key}")
+                return cached
+
+            system_prompt, agent_prompt = self.load_prompts(dimension_key, task_data)
+
+            if not system_prompt or not agent_prompt:
+                return {
+                    "dimension": dimension_key,
+                    "response": "Prompts not configured",
+                    "error": "Empty prompt files"
+                }
+
+            processed_prompt = self.process_agent_prompt(dimension_key, agent_prompt, task_data)
+            response = await self._get_llm_response_async(system_prompt, processed_prompt)
+
+            result = {
                 "dimension": dimension_key,
                 "response": response,
                 "error": None
             }
-        
+            self._cache_put(cache_key, result)
+            return result
+
         except Exception as e:
             self.logger.error(f"Error evaluating {dimension_key}: {e}")
             return {
@@ -511,27 +1047,160 @@ class QualityEvaluator:
                 "response": f"Evaluation error: {str(e)}",
                 "error": str(e)
             }
+
+    async def evaluate_dimensions_async(self, dimension_keys: List[str], task_data: Dict[str, Any],
+                                        max_concurrency: int = None) -> Dict[str, Dict[str, Any]]:
+        """Evaluate several dimensions concurrently with asyncio.gather.
+
+        max_concurrency bounds in-flight LLM calls (defaults to all at once,
+        which for <= 4 dimensions matches the threaded fan-out).
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or len(dimension_keys))
+
+        async def run(dim_key: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.evaluate_quality_dimension_async(dim_key, task_data)
+
+        results = await asyncio.gather(*(run(dim_key) for dim_key in dimension_keys))
+        return dict(zip(dimension_keys, results))
     
-    @traceable(run_type="chain", name="Evaluate Task")
-    def evaluate_task(self, config_path: str, results_path: str) -> Dict[str, Any]:
-        """Evaluate all quality dimensions for a task."""
+    @traceable(run_type="chain", name="Evaluate Task (async)")
+    async def evaluate_task_async(self, config_path: str, results_path: str) -> Dict[str, Any]:
+        """Evaluate all quality dimensions for a task concurrently.
+
+        Dimensions are independent LLM round-trips, so gathering them
+        drops task latency from the sum of per-dimension latencies to
+        roughly the slowest single dimension.
+        """
         task_data = self.load_task_data(config_path, results_path)
-        
+
+        # Detect flags once; every dimension prompt embeds the same list
+        detected_flags = self.detect_flags(task_data)
+        task_data["_detected_flags_json"] = _dumps_indent(detected_flags)
+
         results = {
             "task_id": task_data.get("task_id"),
             "config_file": config_path,
             "results_file": results_path,
             "reviewed_at": datetime.now().isoformat(),
             "evaluation_results": {},
-            "detected_flags": self.detect_flags(task_data)
+            "detected_flags": detected_flags
         }
-        
-        for dimension_key in QUALITY_DIMENSIONS:
-            self.logger.info(f"Evaluating {dimension_key} for {task_data.get('task_id')}")
-            eval_result = self.evaluate_quality_dimension(dimension_key, task_data)
-            
+
+        self.logger.info(f"Evaluating {len(QUALITY_DIMENSIONS)} dimensions for {task_data.get('task_id')}")
+        dimension_results = await self.evaluate_dimensions_async(list(QUALITY_DIMENSIONS), task_data)
+
+        for dimension_key, eval_result in dimension_results.items():
             dimension_name = QUALITY_DIMENSIONS[dimension_key]["name"]
             results["evaluation_results"][dimension_name] = eval_result
             results[dimension_name] = eval_result.get("response", "")
-        
+
+        return results
+
+    @traceable(run_type="chain", name="Evaluate Task")
+    def evaluate_task(self, config_path: str, results_path: str) -> Dict[str, Any]:
+        """Evaluate all quality dimensions for a task.
+
+        Synchronous wrapper around evaluate_task_async for callers that
+        are not running an event loop (batch workers, CLI).
+        """
+        return asyncio.run(self.evaluate_task_async(config_path, results_path))
+
+    def evaluate_tasks_batch(self, pairs: List[Tuple[str, str]],
+                             completion_window: str = "24h",
+                             poll_interval: float = 30.0) -> List[Dict[str, Any]]:
+        """Evaluate many (config_path, results_path) pairs via the Batch API.
+
+        Marshals one request per (task, dimension) into a single batch
+        job, which bills at half price and is not throttled by per-minute
+        rate limits, then polls until completion and regroups responses
+        by task. Only the OpenAI Batch API is wired up; other providers
+        fall back to per-task evaluation.
+        """
+        if self.provider != 'openai':
+            self.logger.warning(
+                "Batch API is only implemented for the openai provider; "
+                "falling back to per-task evaluation")
+            return [self.evaluate_task(c, r) for c, r in pairs]
+
+        # Build one JSONL line per (task, dimension)
+        tasks = {}
+        lines = []
+        for config_path, results_path in pairs:
+            task_data = self.load_task_data(config_path, results_path)
+            detected_flags = self.detect_flags(task_data)
+            task_data["_detected_flags_json"] = _dumps_indent(detected_flags)
+
+            task_id = task_data.get("task_id") or config_path
+            tasks[task_id] = (config_path, results_path, detected_flags)
+
+            for dim_key in QUALITY_DIMENSIONS:
+                system_prompt, agent_prompt = self.load_prompts(dim_key, task_data)
+                if not system_prompt or not agent_prompt:
+                    continue
+                processed = self.process_agent_prompt(dim_key, agent_prompt, task_data)
+                lines.append(json.dumps({
+                    "custom_id": f"{task_id}::{dim_key}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model,
+                        "messages": [
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": processed}
+                        ]
+                    }
+                }))
+
+        batch_input = self.client.files.create(
+            file=("quality_eval_batch.jsonl", "\n".join(lines).encode('utf-8')),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window=completion_window
+        )
+        self.logger.info(f"Submitted batch {batch.id} with {len(lines)} requests")
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+        # Regroup per-dimension responses by custom_id
+        responses = {}
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            body = (record.get("response") or {}).get("body") or {}
+            choices = body.get("choices") or []
+            if choices:
+                responses[record["custom_id"]] = choices[0]["message"]["content"].strip()
+
+        results = []
+        for task_id, (config_path, results_path, detected_flags) in tasks.items():
+            task_result = {
+                "task_id": task_id,
+                "config_file": config_path,
+                "results_file": results_path,
+                "reviewed_at": datetime.now().isoformat(),
+                "evaluation_results": {},
+                "detected_flags": detected_flags
+            }
+            for dim_key, dim_config in QUALITY_DIMENSIONS.items():
+                response_text = responses.get(f"{task_id}::{dim_key}")
+                eval_result = {
+                    "dimension": dim_key,
+                    "response": response_text if response_text is not None else "No response in batch output",
+                    "error": None if response_text is not None else "missing_batch_response"
+                }
+                dimension_name = dim_config["name"]
+                task_result["evaluation_results"][dimension_name] = eval_result
+                task_result[dimension_name] = eval_result.get("response", "")
+            results.append(task_result)
+
         return results
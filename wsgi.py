@@ -0,0 +1,11 @@
+"""
+RLToolUseEval WSGI Entry Point
+Serve the frontend under a production WSGI server instead of Flask's
+dev server, e.g.:
+
+    gunicorn -w $(nproc) -k gthread --threads 8 --timeout 300 wsgi:app
+
+Size --threads to at least 2x THREADS_PER_TASK so one request's
+dimension fan-out doesn't starve other requests.
+"""
+from frontend.app import app  # noqa: F401